@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of JSON decoding of WebSocket account notifications.
+
+Decodes synthetic accountNotification frames carrying a price account with
+every installed JSON backend of pythclient.codec, and with
+codec.decode_ws_message, which only extracts the fields needed to update the
+account.
+
+Usage: python benchmarks/decode_notifications.py [iterations]
+"""
+
+from __future__ import annotations
+import base64
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pythclient import codec  # noqa
+
+from parse_price_account import make_price_account  # noqa
+
+
+def make_notification() -> str:
+    data = base64.b64encode(make_price_account()).decode("ascii")
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "accountNotification",
+        "params": {
+            "subscription": 42,
+            "result": {
+                "context": {"slot": 1000},
+                "value": {
+                    "data": [data, "base64"],
+                    "executable": False,
+                    "lamports": 23942400,
+                    "owner": "FsJ3A3u2vn5cTVofAjvy6y5kwABJAqYWpe4975bi2epH",
+                    "rentEpoch": 361,
+                },
+            },
+        },
+    })
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    frame = make_notification()
+    baseline = timeit.timeit(lambda: json.loads(frame), number=iterations)
+    for name in codec.AVAILABLE_BACKENDS:
+        try:
+            codec.use(name)
+        except ImportError:
+            print(f"{name:8}: not installed")
+            continue
+        loads = codec.loads
+        elapsed = timeit.timeit(lambda: loads(frame), number=iterations)
+        print(f"{name:8}: {elapsed / iterations * 1e6:8.3f} us/frame ({baseline / elapsed:.1f}x)")
+    elapsed = timeit.timeit(lambda: codec.decode_ws_message(frame), number=iterations)
+    print(f"decode_ws_message: {elapsed / iterations * 1e6:8.3f} us/frame ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
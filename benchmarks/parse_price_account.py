@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of price account parsing.
+
+Compares unpacking the fixed region of a v2 price account with a chain of
+struct.unpack_from calls on format strings against a single precompiled
+layout, and reports the cost of a full PythPriceAccount.update_from.
+
+Usage: python benchmarks/parse_price_account.py [iterations]
+"""
+
+from __future__ import annotations
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pythclient import layouts  # noqa
+from pythclient.pythaccounts import ACCOUNT_HEADER_BYTES, PythPriceAccount, _VERSION_2  # noqa
+from pythclient.solana import SolanaPublicKey  # noqa
+
+NUM_COMPONENTS = 32
+
+
+def make_price_account(num_components: int = NUM_COMPONENTS) -> bytes:
+    fixed = layouts.PRICE_V2_WITH_AGGREGATE.pack(
+        1, -8, num_components, num_components, 1000, 999,
+        1, 2, 3, 4, 5, 6, 1700000000, 3, 0, 25, 0, 0,
+        bytes(range(1, 33)), bytes(32),
+        998, 6000000000000, 1500000, 1699999999,
+        6000000000000, 1500000, 1, 0, 999,
+    )
+    components = b"".join(
+        layouts.PRICE_COMPONENT.pack(
+            bytes([i + 1] * 32),
+            6000000000000 + i, 1500000, 1, 0, 998,
+            6000000000000 + i, 1500000, 1, 0, 999,
+        )
+        for i in range(num_components)
+    )
+    size = ACCOUNT_HEADER_BYTES + len(fixed) + len(components)
+    header = layouts.ACCOUNT_HEADER.pack(0xA1B2C3D4, _VERSION_2, 3, size)
+    return header + fixed + components
+
+
+def unpack_format_strings(buffer: bytes) -> None:
+    offset = ACCOUNT_HEADER_BYTES
+    struct.unpack_from("<IiI", buffer, offset)
+    offset += 16
+    struct.unpack_from("<QQ", buffer, offset)
+    offset += 16
+    struct.unpack_from("<6q", buffer, offset)
+    offset += 48
+    struct.unpack_from("<qB", buffer, offset)
+    offset += 9
+    struct.unpack_from("<bB", buffer, offset)
+    offset += 2
+    struct.unpack_from("<bi", buffer, offset)
+    offset += 5
+    struct.unpack_from("32s32s", buffer, offset)
+    offset += 64
+    struct.unpack_from("<QqQq", buffer, offset)
+    offset += 32
+    struct.unpack_from("<qQIIQ", buffer, offset)
+
+
+def unpack_layout(buffer: bytes) -> None:
+    layouts.PRICE_V2_WITH_AGGREGATE.unpack_from(buffer, ACCOUNT_HEADER_BYTES)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    buffer = make_price_account()
+    account = PythPriceAccount(SolanaPublicKey(bytes(range(32))), None)  # type: ignore
+
+    def update_from() -> None:
+        account.update_from(buffer, version=_VERSION_2, offset=ACCOUNT_HEADER_BYTES)
+
+    fmt_time = timeit.timeit(lambda: unpack_format_strings(buffer), number=iterations)
+    layout_time = timeit.timeit(lambda: unpack_layout(buffer), number=iterations)
+    full_iterations = max(iterations // 100, 1)
+    full_time = timeit.timeit(update_from, number=full_iterations)
+
+    print(f"fixed region, format strings: {fmt_time / iterations * 1e6:8.3f} us/account")
+    print(f"fixed region, precompiled:    {layout_time / iterations * 1e6:8.3f} us/account"
+          f" ({fmt_time / layout_time:.1f}x)")
+    print(f"full update_from ({NUM_COMPONENTS} components): {full_time / full_iterations * 1e6:8.3f} us/account")
+
+
+if __name__ == "__main__":
+    main()
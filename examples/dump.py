@@ -66,39 +66,29 @@ async def main():
             await ws.program_subscribe(v2_program_key, await c.get_all_accounts())
         else:
             print("Subscribing to all prices")
-            for account in all_prices:
-                await ws.subscribe(account)
+            subscribed, failed = await ws.subscribe_many(all_prices)
+            if failed:
+                print(f"Failed to subscribe to {failed} of {subscribed + failed} prices")
         print("Subscribed!")
 
-        while True:
-            if to_exit:
-                break
-            update_task = asyncio.create_task(ws.next_update())
-            while True:
-                if to_exit:
-                    update_task.cancel()
-                    break
-                done, _ = await asyncio.wait({update_task}, timeout=1)
-                if update_task in done:
-                    pr = update_task.result()
-                    if isinstance(pr, PythPriceAccount):
-                        assert pr.product
-                        print(
-                            pr.product.symbol,
-                            pr.price_type,
-                            pr.aggregate_price_status,
-                            pr.aggregate_price,
-                            "p/m",
-                            pr.aggregate_price_confidence_interval,
-                        )
-                    break
+        while not to_exit:
+            for pr in await ws.next_updates(max_wait=1):
+                if isinstance(pr, PythPriceAccount):
+                    assert pr.product
+                    print(
+                        pr.product.symbol,
+                        pr.price_type,
+                        pr.aggregate_price_status,
+                        pr.aggregate_price,
+                        "p/m",
+                        pr.aggregate_price_confidence_interval,
+                    )
 
         print("Unsubscribing...")
         if use_program:
             await ws.program_unsubscribe(v2_program_key)
         else:
-            for account in all_prices:
-                await ws.unsubscribe(account)
+            await ws.unsubscribe_many(all_prices)
         await ws.disconnect()
         print("Disconnected")
 
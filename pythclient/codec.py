@@ -0,0 +1,262 @@
+"""
+JSON encoding and decoding of RPC and WebSocket payloads.
+
+msgspec or orjson is used when installed (the 'fast' extra installs both),
+falling back to the standard library json module otherwise. The backend can be
+chosen explicitly with use().
+
+Account and program notifications received on the WebSocket are decoded by
+decode_ws_message(), which only extracts the fields needed to update an
+account. With the msgspec backend this is done by a typed decoder which skips
+over the rest of the frame without building dicts for it; the other backends
+decode the whole frame with their loads().
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Loads = Callable[[Union[str, bytes]], Any]
+Dumps = Callable[[Any], str]
+
+_BACKENDS: Dict[str, Callable[[], Tuple[Loads, Dumps]]] = {}
+
+
+def _backend(name: str):
+    def register(factory: Callable[[], Tuple[Loads, Dumps]]):
+        _BACKENDS[name] = factory
+        return factory
+    return register
+
+
+@_backend("orjson")
+def _orjson() -> Tuple[Loads, Dumps]:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    return orjson.loads, dumps
+
+
+@_backend("msgspec")
+def _msgspec() -> Tuple[Loads, Dumps]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode("utf-8")
+
+    return msgspec.json.Decoder().decode, dumps
+
+
+@_backend("json")
+def _stdlib() -> Tuple[Loads, Dumps]:
+    return json.loads, json.dumps
+
+
+# in order of preference; msgspec comes first as only it has the typed
+# WebSocket decoder
+AVAILABLE_BACKENDS = ("msgspec", "orjson", "json")
+
+backend: str = "json"
+loads: Loads = json.loads
+dumps: Dumps = json.dumps
+
+
+def use(name: str) -> None:
+    """
+    Selects the JSON backend: one of "orjson", "msgspec" or "json".
+
+    Raises ImportError if the backend is not installed.
+    """
+    global backend, loads, dumps, _decode_ws_message
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown JSON backend {name}, expected one of {AVAILABLE_BACKENDS}")
+    loads, dumps = _BACKENDS[name]()
+    backend = name
+    _decode_ws_message = _decode_ws_message_typed if name == "msgspec" else _decode_ws_message_generic
+
+
+def _use_fastest() -> None:
+    for name in AVAILABLE_BACKENDS:
+        try:
+            use(name)
+            return
+        except ImportError:
+            continue
+
+
+ACCOUNT_NOTIFICATION = "accountNotification"
+PROGRAM_NOTIFICATION = "programNotification"
+
+
+class AccountNotification:
+    """
+    An accountNotification or programNotification received on the WebSocket,
+    reduced to the fields needed to update an account.
+
+    Attributes:
+        method (str): ACCOUNT_NOTIFICATION or PROGRAM_NOTIFICATION
+        subscription (int): the subscription id
+        slot (int): the slot of the notification
+        pubkey (Optional[str]): the key of the account (only for program
+            notifications)
+        data (Any): the account data, as [data, encoding]
+        lamports (Optional[int]): the account balance
+    """
+
+    __slots__ = ("method", "subscription", "slot", "pubkey", "data", "lamports", "_frame", "_message")
+
+    def __init__(
+        self,
+        method: str,
+        subscription: int,
+        slot: int,
+        data: Any,
+        lamports: Optional[int] = None,
+        pubkey: Optional[str] = None,
+        frame: Union[str, bytes, None] = None,
+        message: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.method = method
+        self.subscription = subscription
+        self.slot = slot
+        self.pubkey = pubkey
+        self.data = data
+        self.lamports = lamports
+        self._frame = frame
+        self._message = message
+
+    @property
+    def value(self) -> Dict[str, Any]:
+        """
+        The account value, as accepted by
+        SolanaAccount.update_with_rpc_response.
+        """
+        return {"data": self.data, "lamports": self.lamports}
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        """
+        The complete notification message, decoded on first access.
+        """
+        if self._message is None:
+            if self._frame is not None:
+                self._message = loads(self._frame)
+            else:
+                value = self.value
+                if self.pubkey is not None:
+                    value = {"pubkey": self.pubkey, "account": value}
+                self._message = {
+                    "jsonrpc": "2.0",
+                    "method": self.method,
+                    "params": {
+                        "subscription": self.subscription,
+                        "result": {"context": {"slot": self.slot}, "value": value},
+                    },
+                }
+        return self._message
+
+    def __repr__(self) -> str:
+        return (f"AccountNotification(method={self.method!r}, subscription={self.subscription}, "
+                f"slot={self.slot}, pubkey={self.pubkey!r})")
+
+
+def _decode_ws_message_generic(frame: Union[str, bytes]) -> Union[AccountNotification, Dict[str, Any]]:
+    msg = loads(frame)
+    method = msg.get("method")
+    if method != ACCOUNT_NOTIFICATION and method != PROGRAM_NOTIFICATION:
+        return msg
+    params = msg["params"]
+    result = params["result"]
+    value = result["value"]
+    pubkey = None
+    if method == PROGRAM_NOTIFICATION:
+        pubkey = value["pubkey"]
+        value = value["account"]
+    return AccountNotification(
+        method, params["subscription"], result["context"]["slot"],
+        value.get("data"), value.get("lamports"), pubkey, message=msg,
+    )
+
+
+if msgspec is not None:
+    class _Account(msgspec.Struct):
+        data: Any = None
+        lamports: Optional[int] = None
+
+    class _Value(msgspec.Struct):
+        data: Any = None
+        lamports: Optional[int] = None
+        pubkey: Optional[str] = None
+        account: Optional[_Account] = None
+
+    class _Context(msgspec.Struct):
+        slot: int
+
+    class _Result(msgspec.Struct):
+        context: Optional[_Context] = None
+        value: Optional[_Value] = None
+
+    class _Params(msgspec.Struct):
+        subscription: Optional[int] = None
+        result: Optional[_Result] = None
+
+    class _Message(msgspec.Struct):
+        method: Optional[str] = None
+        params: Optional[_Params] = None
+        id: Any = None
+        result: Any = None
+        error: Any = None
+
+    _message_decoder = msgspec.json.Decoder(_Message)
+
+    def _decode_ws_message_typed(frame: Union[str, bytes]) -> Union[AccountNotification, Dict[str, Any]]:
+        try:
+            msg = _message_decoder.decode(frame)
+        except msgspec.ValidationError:
+            # not shaped like an account notification or a response
+            return loads(frame)
+        method = msg.method
+        if method is None:
+            return {"id": msg.id, "result": msg.result, "error": msg.error}
+        params = msg.params
+        if (
+            (method != ACCOUNT_NOTIFICATION and method != PROGRAM_NOTIFICATION)
+            or params is None or params.subscription is None or params.result is None
+            or params.result.context is None or params.result.value is None
+        ):
+            return _decode_ws_message_generic(frame)
+        slot = params.result.context.slot
+        value = params.result.value
+        if method == PROGRAM_NOTIFICATION:
+            account = value.account
+            if account is None or value.pubkey is None:
+                return _decode_ws_message_generic(frame)
+            return AccountNotification(
+                method, params.subscription, slot, account.data, account.lamports, value.pubkey, frame=frame,
+            )
+        return AccountNotification(method, params.subscription, slot, value.data, value.lamports, frame=frame)
+
+
+# replaced by use()
+_decode_ws_message = _decode_ws_message_generic
+_use_fastest()
+
+
+def decode_ws_message(frame: Union[str, bytes]) -> Union[AccountNotification, Dict[str, Any]]:
+    """
+    Decodes a JSON-RPC message received on the WebSocket.
+
+    Account and program notifications are returned as AccountNotification
+    objects; any other message (responses to requests, other notifications)
+    is returned as a dict.
+    """
+    return _decode_ws_message(frame)
@@ -5,6 +5,10 @@ Library-wide settings.
 BACKOFF_MAX_VALUE = 16
 BACKOFF_MAX_TRIES = 8
 
+# Whether PythPriceAccount decodes its price components only when they are
+# accessed, unless overridden per account
+LAZY_PRICE_COMPONENTS = False
+
 # The following getter functions are passed to the backoff decorators
 
 def get_backoff_max_value() -> int:
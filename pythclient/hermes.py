@@ -2,9 +2,9 @@ import asyncio
 from typing import TypedDict
 import httpx
 import os
-import json
 import websockets
 
+from . import codec
 from .price_feeds import Price
 
 HERMES_ENDPOINT_HTTPS = "https://hermes.pyth.network/"
@@ -42,7 +42,7 @@ class HermesClient:
         url = os.path.join(self.endpoint, "api/price_feed_ids")
 
         async with httpx.AsyncClient() as client:
-            data = (await client.get(url)).json()
+            data = codec.loads((await client.get(url)).content)
 
         return data
 
@@ -108,7 +108,7 @@ class HermesClient:
             parse_unsupported_version(version)
 
         async with httpx.AsyncClient() as client:
-            data = (await client.get(url, params=params)).json()
+            data = codec.loads((await client.get(url, params=params)).content)
 
         if version==1:
             results = []
@@ -134,7 +134,7 @@ class HermesClient:
             parse_unsupported_version(version)
 
         async with httpx.AsyncClient() as client:
-            data = (await client.get(url, params=params)).json()
+            data = codec.loads((await client.get(url, params=params)).content)
 
         if version==1:
             price_feed = self.extract_price_feed_v1(data)
@@ -177,10 +177,10 @@ class HermesClient:
                         "verbose": True,
                         "binary": True,
                     }
-                    await ws.send(json.dumps(json_subscribe))
+                    await ws.send(codec.dumps(json_subscribe))
                     self.pending_feed_ids = []
 
-                msg = json.loads(await ws.recv())
+                msg = codec.loads(await ws.recv())
                 if msg.get("type") == "response":
                     if msg.get("status") != "success":
                         raise Exception("Error in subscribing to websocket")
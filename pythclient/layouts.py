@@ -0,0 +1,43 @@
+"""
+Precompiled binary layouts of the Pyth on-chain account structures.
+
+Each layout unpacks a whole fixed-size region of an account in a single call.
+All integers are little-endian and there is no padding between fields.
+"""
+
+import struct
+
+# magic (u32), version (u32), account type (u32), account data size (u32)
+ACCOUNT_HEADER = struct.Struct("<IIII")
+
+# number of products (u32), unused (u32), next mapping account key (char[32])
+MAPPING_HEADER = struct.Struct("<II32s")
+
+# first price account key (char[32])
+PRODUCT_HEADER = struct.Struct("<32s")
+
+# price (i64), confidence interval (u64), status (u32), corporate action (u32),
+# publish slot (u64)
+PRICE_INFO = struct.Struct("<qQIIQ")
+
+# publisher key (char[32]), last aggregate price info (PRICE_INFO),
+# latest price info (PRICE_INFO)
+PRICE_COMPONENT = struct.Struct("<32sqQIIQqQIIQ")
+
+# price type (u32), exponent (i32), number of components (u32), unused (u32),
+# last slot (u64), valid slot (u64), product account key (char[32]),
+# next price account key (char[32]), aggregator key (char[32])
+PRICE_V1 = struct.Struct("<IiIIQQ32s32s32s")
+
+# price type (u32), exponent (i32), number of components (u32),
+# number of quoters in the aggregate (u32), last slot (u64), valid slot (u64),
+# derivations (i64[6]), timestamp (i64), minimum publishers (u8),
+# message sent (i8), max latency (u8), unused (i8, i32),
+# product account key (char[32]), next price account key (char[32]),
+# previous slot (u64), previous price (i64), previous confidence (u64),
+# previous timestamp (i64)
+PRICE_V2 = struct.Struct("<IiIIQQ6qqBbBbi32s32sQqQq")
+
+# the fixed regions of price accounts followed by the aggregate price info
+PRICE_V1_WITH_AGGREGATE = struct.Struct(PRICE_V1.format + PRICE_INFO.format[1:])
+PRICE_V2_WITH_AGGREGATE = struct.Struct(PRICE_V2.format + PRICE_INFO.format[1:])
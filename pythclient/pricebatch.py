@@ -0,0 +1,201 @@
+"""Columnar bulk decoding of many Pyth price accounts at once."""
+
+from __future__ import annotations
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import base64
+
+from loguru import logger
+
+from . import layouts
+from .solana import SolanaPublicKey, SolanaClient
+from .pythaccounts import (
+    ACCOUNT_HEADER_BYTES,
+    PythAccountType,
+    PythPriceAccount,
+    PythPriceInfo,
+    PythPriceStatus,
+    _VERSION_1,
+    _VERSION_2,
+    _check_base64,
+    _parse_header,
+)
+
+# base64 characters needed to decode the first 12 bytes of the account header
+# (magic, version, account type) without decoding the whole account
+_HEADER_PREFIX_B64_CHARS = 16
+
+
+class PythPriceBatch:
+    """
+    Decoded aggregate data of many price accounts, stored column-wise.
+
+    Each column is an array with one entry per account, in the order the
+    accounts were given. The raw account buffers are kept so that full
+    PythPriceAccount objects (including price components) can be built on
+    demand with price_account().
+
+    Attributes:
+        slot (Optional[int]): the slot at which the accounts were fetched
+        keys (List[str]): the base58-encoded public keys of the accounts
+        price_type (array): PythPriceType values
+        exponent (array): the power-of-10 order of each account
+        num_components (array): number of price components
+        last_slot (array): slot of last valid aggregate price information
+        valid_slot (array): slot of the current aggregate price
+        timestamp (array): unix timestamp of the aggregate price (v2 only)
+        min_publishers (array): minimum number of publishers (v2 only)
+        max_latency (array): maximum allowed slot difference (v2 only)
+        raw_price (array): raw aggregate price
+        raw_confidence_interval (array): raw aggregate confidence interval
+        price_status (array): PythPriceStatus values of the aggregate price
+        pub_slot (array): publish slot of the aggregate price
+        price (array): aggregate price, scaled by exponent
+        confidence_interval (array): aggregate confidence interval, scaled by
+            exponent
+    """
+
+    def __init__(self, slot: Optional[int] = None) -> None:
+        self.slot = slot
+        self.keys: List[str] = []
+        self.price_type = array("I")
+        self.exponent = array("i")
+        self.num_components = array("I")
+        self.last_slot = array("Q")
+        self.valid_slot = array("Q")
+        self.timestamp = array("q")
+        self.min_publishers = array("B")
+        self.max_latency = array("B")
+        self.raw_price = array("q")
+        self.raw_confidence_interval = array("Q")
+        self.price_status = array("I")
+        self.pub_slot = array("Q")
+        self.price = array("d")
+        self.confidence_interval = array("d")
+        self._buffers: List[Tuple[bytes, int]] = []
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return str(key) in self._index
+
+    def index_of(self, key: Any) -> int:
+        """
+        Gets the column index of the account with the given key.
+
+        Raises KeyError if the account is not part of this batch.
+        """
+        return self._index[str(key)]
+
+    def append(self, key: Any, buffer: bytes, *, partial: bool = False) -> bool:
+        """
+        Decodes the price account in buffer (including the account header) and
+        appends it to the columns.
+
+        Set partial if buffer may hold only the start of the account data, at
+        least up to the aggregate price info (PRICE_AGGREGATE_DATA_LENGTH
+        bytes). Accounts built from partial data have no price components.
+
+        Returns False, without appending anything, if buffer does not contain a
+        price account.
+        """
+        keystr = str(key)
+        type_, size, version = _parse_header(buffer, 0, key=keystr, partial=partial)
+        if type_ != PythAccountType.PRICE:
+            return False
+
+        if version == _VERSION_2:
+            (price_type, exponent, num_components, _, last_slot, valid_slot,
+             _d0, _d1, _d2, _d3, _d4, _d5, timestamp, min_publishers,
+             _message_sent, max_latency, _drv_3, _drv_4, _product, _next,
+             _prev_slot, _prev_price, _prev_conf, _prev_timestamp,
+             raw_price, raw_conf, status, _, pub_slot) = layouts.PRICE_V2_WITH_AGGREGATE.unpack_from(buffer, ACCOUNT_HEADER_BYTES)
+        elif version == _VERSION_1:
+            (price_type, exponent, num_components, _, last_slot, valid_slot,
+             _product, _next, _aggregator,
+             raw_price, raw_conf, status, _, pub_slot) = layouts.PRICE_V1_WITH_AGGREGATE.unpack_from(buffer, ACCOUNT_HEADER_BYTES)
+            timestamp = min_publishers = max_latency = 0
+        else:
+            assert False
+
+        scale = 10 ** exponent
+        self.price_type.append(price_type)
+        self.exponent.append(exponent)
+        self.num_components.append(num_components)
+        self.last_slot.append(last_slot)
+        self.valid_slot.append(valid_slot)
+        self.timestamp.append(timestamp)
+        self.min_publishers.append(min_publishers)
+        self.max_latency.append(max_latency)
+        self.raw_price.append(raw_price)
+        self.raw_confidence_interval.append(raw_conf)
+        self.price_status.append(status)
+        self.pub_slot.append(pub_slot)
+        self.price.append(raw_price * scale)
+        self.confidence_interval.append(raw_conf * scale)
+        self._index[keystr] = len(self.keys)
+        self.keys.append(keystr)
+        self._buffers.append((buffer[:size], version))
+        return True
+
+    def aggregate_price_info(self, index: int) -> PythPriceInfo:
+        """
+        Builds the aggregate PythPriceInfo of the account at the given index.
+        """
+        return PythPriceInfo(
+            self.raw_price[index],
+            self.raw_confidence_interval[index],
+            PythPriceStatus(self.price_status[index]),
+            self.pub_slot[index],
+            self.exponent[index],
+        )
+
+    def price_account(self, index: int, solana: SolanaClient) -> PythPriceAccount:
+        """
+        Builds a fully decoded PythPriceAccount for the account at the given
+        index.
+        """
+        buffer, version = self._buffers[index]
+        account = PythPriceAccount(SolanaPublicKey(self.keys[index]), solana)
+        account.slot = self.slot
+        account.update_from(buffer, version=version, offset=ACCOUNT_HEADER_BYTES)
+        return account
+
+    @staticmethod
+    def from_buffers(buffers: Iterable[Tuple[Any, bytes]], slot: Optional[int] = None) -> PythPriceBatch:
+        """
+        Decodes (key, raw account data) pairs into a PythPriceBatch. Accounts
+        that are not price accounts are skipped.
+        """
+        batch = PythPriceBatch(slot)
+        for key, buffer in buffers:
+            try:
+                batch.append(key, buffer)
+            except Exception as e:
+                logger.exception("error while parsing price account {}", key, exception=e)
+        return batch
+
+    @staticmethod
+    def from_program_accounts(resp: Dict[str, Any], *, partial: bool = False) -> PythPriceBatch:
+        """
+        Decodes a getProgramAccounts JSON RPC response (with context) into a
+        PythPriceBatch. Accounts that are not price accounts are skipped
+        without decoding more than their header.
+
+        Set partial if the accounts were requested with a data slice (see
+        append).
+        """
+        batch = PythPriceBatch(resp["context"]["slot"])
+        for entry in resp["value"]:
+            data_base64, data_format = entry["account"]["data"]
+            _check_base64(data_format)
+            prefix = base64.b64decode(data_base64[:_HEADER_PREFIX_B64_CHARS])
+            if len(prefix) < 12 or int.from_bytes(prefix[8:12], "little") != PythAccountType.PRICE.value:
+                continue
+            try:
+                batch.append(entry["pubkey"], base64.b64decode(data_base64), partial=partial)
+            except Exception as e:
+                logger.exception("error while parsing price account {}", entry["pubkey"], exception=e)
+        return batch
@@ -0,0 +1,211 @@
+"""
+Columnar in-memory store of the aggregate prices of many price accounts.
+
+Columns are array.array objects; when NumPy is installed they can be viewed
+as NumPy arrays without copying (see PythPriceStore.column), and queries are
+vectorised.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Any, Dict, List, Optional
+from typing_extensions import Protocol
+from loguru import logger
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .pythaccounts import PythPriceAccount, PythPriceStatus
+
+# column name -> array typecode
+COLUMNS: Dict[str, str] = {
+    "raw_price": "q",
+    "raw_confidence_interval": "Q",
+    "exponent": "i",
+    "price": "d",
+    "confidence_interval": "d",
+    "price_status": "I",
+    "pub_slot": "Q",
+    "valid_slot": "Q",
+    "timestamp": "q",
+    "slot": "Q",
+}
+
+
+class PythPriceSink(Protocol):
+    """
+    Anything price account updates can be written into, such as a
+    PythPriceStore or a sharedprices.SharedPriceTable.
+    """
+
+    def update(self, account: PythPriceAccount) -> Optional[int]:
+        ...
+
+
+def update_price_sink(sink: PythPriceSink, account: PythPriceAccount) -> Optional[int]:
+    """
+    Writes a price account into a sink like sink.update, but logs errors (such
+    as a full SharedPriceTable) instead of raising them, so one failed write
+    does not stop the loop feeding the sink.
+    """
+    try:
+        return sink.update(account)
+    except Exception as e:
+        logger.exception("exception while writing price {} to price store", account.key, exception=e)
+        return None
+
+
+class PythPriceStore:
+    """
+    Aggregate price data of many price accounts, stored column-wise and
+    updated in place.
+
+    Each price account gets a dense index the first time it is written with
+    update(); its row in every column is overwritten by later updates. Pass a
+    store to PythClient to have refresh_all_prices and watch sessions write
+    into it.
+
+    Attributes:
+        keys (List[str]): the base58-encoded price account key of each row
+        symbols (List[Optional[str]]): the product symbol of each row, if the
+            product of the price account was known when the row was added
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.symbols: List[Optional[str]] = []
+        self._index: Dict[str, int] = {}
+        self._columns: Dict[str, array] = dict((name, array(typecode)) for name, typecode in COLUMNS.items())
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return str(key) in self._index
+
+    def index_of(self, key: Any) -> int:
+        """
+        Gets the row index of the price account with the given key.
+
+        Raises KeyError if the account was never written to this store.
+        """
+        return self._index[str(key)]
+
+    def update(self, account: PythPriceAccount) -> Optional[int]:
+        """
+        Writes the aggregate price of the given price account into its row,
+        adding a row if needed. Returns the row index, or None if the account
+        has no price data yet.
+        """
+        info = account.aggregate_price_info
+        if info is None:
+            return None
+        key = str(account.key)
+        columns = self._columns
+        index = self._index.get(key)
+        if index is None:
+            index = self._add_row()
+            self._index[key] = index
+            self.keys.append(key)
+            self.symbols.append(account.product.symbol if account.product else None)
+        columns["raw_price"][index] = info.raw_price
+        columns["raw_confidence_interval"][index] = info.raw_confidence_interval
+        columns["exponent"][index] = info.exponent
+        columns["price"][index] = info.price
+        columns["confidence_interval"][index] = info.confidence_interval
+        columns["price_status"][index] = info.price_status.value
+        columns["pub_slot"][index] = info.pub_slot
+        columns["valid_slot"][index] = account.valid_slot
+        columns["timestamp"][index] = account.timestamp
+        columns["slot"][index] = account.slot or 0
+        return index
+
+    def _add_row(self) -> int:
+        # grow every column before the row is registered; a column viewed by
+        # NumPy cannot grow (BufferError), in which case the columns already
+        # grown are shrunk back so the store stays consistent
+        grown: List[array] = []
+        try:
+            for column in self._columns.values():
+                column.append(0)
+                grown.append(column)
+        except BaseException:
+            for column in grown:
+                column.pop()
+            raise
+        return len(self.keys)
+
+    def column(self, name: str) -> Any:
+        """
+        Gets a column by name (one of COLUMNS).
+
+        With NumPy installed this is a NumPy array sharing memory with the
+        store, so it reflects later in-place updates. Rows cannot be added
+        while such a view is alive: update raises BufferError for a new
+        account, leaving the store unchanged, until the view is dropped. Without NumPy the underlying array.array is returned.
+        """
+        column = self._columns[name]
+        if numpy is None:
+            return column
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def select(
+        self,
+        price_status: Optional[PythPriceStatus] = PythPriceStatus.TRADING,
+        max_confidence_ratio: Optional[float] = None,
+        min_pub_slot: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Gets the keys of the price accounts matching all of the given
+        conditions.
+
+        Args:
+            price_status: the aggregate price status, or None for any status
+            max_confidence_ratio: the maximum confidence interval / |price|
+            min_pub_slot: the minimum publish slot of the aggregate price
+        """
+        if numpy is not None:
+            return self._select_numpy(price_status, max_confidence_ratio, min_pub_slot)
+        columns = self._columns
+        status_column = columns["price_status"]
+        price_column = columns["price"]
+        conf_column = columns["confidence_interval"]
+        pub_slot_column = columns["pub_slot"]
+        selected = []
+        for i, key in enumerate(self.keys):
+            if price_status is not None and status_column[i] != price_status.value:
+                continue
+            if max_confidence_ratio is not None and conf_column[i] > max_confidence_ratio * abs(price_column[i]):
+                continue
+            if min_pub_slot is not None and pub_slot_column[i] < min_pub_slot:
+                continue
+            selected.append(key)
+        return selected
+
+    def _select_numpy(
+        self,
+        price_status: Optional[PythPriceStatus],
+        max_confidence_ratio: Optional[float],
+        min_pub_slot: Optional[int],
+    ) -> List[str]:
+        mask = numpy.ones(len(self.keys), dtype=bool)
+        if price_status is not None:
+            mask &= self.column("price_status") == price_status.value
+        if max_confidence_ratio is not None:
+            mask &= self.column("confidence_interval") <= max_confidence_ratio * numpy.abs(self.column("price"))
+        if min_pub_slot is not None:
+            mask &= self.column("pub_slot") >= min_pub_slot
+        keys = self.keys
+        return [keys[i] for i in numpy.flatnonzero(mask)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copies the whole store, as a dict with the "keys" and "symbols" lists
+        and one array.array per column.
+        """
+        snapshot: Dict[str, Any] = {"keys": list(self.keys), "symbols": list(self.symbols)}
+        for name, column in self._columns.items():
+            snapshot[name] = array(column.typecode, column)
+        return snapshot
@@ -1,16 +1,15 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple, Optional, Any, ClassVar
+from typing import List, Dict, Tuple, Optional, Any, ClassVar, Sequence, Union, overload
 import base64
 from enum import Enum
 from dataclasses import dataclass, field
-import struct
 
 from loguru import logger
 
 from pythclient.market_schedule import MarketSchedule
 
-from . import exceptions
-from .solana import SolanaPublicKey, SolanaPublicKeyOrStr, SolanaClient, SolanaAccount
+from . import config, exceptions, layouts
+from .solana import SolanaPublicKey, SolanaPublicKeyOrStr, SolanaClient, SolanaAccount, memcmp_filter
 
 
 _MAGIC = 0xA1B2C3D4
@@ -18,6 +17,8 @@ _VERSION_1 = 1
 _VERSION_2 = 2
 _SUPPORTED_VERSIONS = set((_VERSION_1, _VERSION_2))
 ACCOUNT_HEADER_BYTES = 16  # magic + version + type + size, u32 * 4
+# length of a price account's data up to the end of the aggregate price info
+PRICE_AGGREGATE_DATA_LENGTH = ACCOUNT_HEADER_BYTES + layouts.PRICE_V2_WITH_AGGREGATE.size
 _NULL_KEY_BYTES = b'\x00' * SolanaPublicKey.LENGTH
 DEFAULT_MAX_LATENCY = 25
 
@@ -59,11 +60,20 @@ def _check_base64(format: str):
         raise Exception(f"unexpected data type from Solana: {format}")
 
 
+def account_type_filter(account_type: PythAccountType) -> Dict[str, Any]:
+    """
+    Builds a getProgramAccounts/programSubscribe filter matching Pyth
+    accounts of the given type.
+    """
+    # the account type is the third u32 of the account header
+    return memcmp_filter(8, account_type.value.to_bytes(4, "little"))
+
+
 def _read_public_key_or_none(buffer: bytes, offset: int = 0) -> Optional[SolanaPublicKey]:
     buffer = buffer[offset:offset + SolanaPublicKey.LENGTH]
     if buffer == _NULL_KEY_BYTES:
         return None
-    return SolanaPublicKey(buffer)
+    return SolanaPublicKey.from_bytes(buffer)
 
 
 def _read_attribute_string(buffer: bytes, offset: int) -> Tuple[Optional[str], int]:
@@ -80,7 +90,11 @@ def _read_attribute_string(buffer: bytes, offset: int) -> Tuple[Optional[str], i
     return data.decode('utf8', 'replace'), data_end
 
 
-def _parse_header(buffer: bytes, offset: int = 0, *, key: SolanaPublicKeyOrStr) -> Tuple[PythAccountType, int, int]:
+def _parse_header(
+    buffer: bytes, offset: int = 0, *, key: SolanaPublicKeyOrStr, partial: bool = False
+) -> Tuple[PythAccountType, int, int]:
+    # partial: buffer may hold only the start of the account data (when
+    # fetched with a data slice)
     if len(buffer) - offset < ACCOUNT_HEADER_BYTES:
         raise ValueError("Pyth account data too short")
 
@@ -88,9 +102,9 @@ def _parse_header(buffer: bytes, offset: int = 0, *, key: SolanaPublicKeyOrStr)
     # version (u32) == VERSION_1 or 2
     # account type (u32)
     # account data size (u32)
-    magic, version, type_, size = struct.unpack_from("<IIII", buffer, offset)
+    magic, version, type_, size = layouts.ACCOUNT_HEADER.unpack_from(buffer, offset)
 
-    if len(buffer) < size:
+    if len(buffer) < size and not partial:
         raise ValueError(
             f"{key} Pyth header says data is {size} bytes, but buffer only has {len(buffer)} bytes")
 
@@ -108,10 +122,22 @@ def _parse_header(buffer: bytes, offset: int = 0, *, key: SolanaPublicKeyOrStr)
 class PythAccount(SolanaAccount):
     """
     Represents a Pyth account.
+
+    Attributes:
+        updates_applied (int): number of RPC responses whose account data was
+            parsed into this object
+        updates_skipped (int): number of RPC responses which were not parsed
+            because their account data was identical to the last one applied
     """
 
     def __init__(self, key: SolanaPublicKeyOrStr, solana: SolanaClient) -> None:
         super().__init__(key, solana)
+        self.updates_applied = 0
+        self.updates_skipped = 0
+        # base64 account data of the last applied RPC response
+        self._last_data_base64: Optional[str] = None
+        # raw account data (including the header) of the last applied update
+        self._data: Optional[bytes] = None
 
     def update_from(self, buffer: bytes, *, version: int, offset: int = 0) -> None:
         """
@@ -122,10 +148,17 @@ class PythAccount(SolanaAccount):
         """
         raise NotImplementedError("update_from should be overridden")
 
-    def update_with_rpc_response(self, slot: int, value: Dict[str, Any]) -> None:
+    def update_with_rpc_response(self, slot: int, value: Dict[str, Any], *, partial: bool = False) -> None:
         """
         Update the data in this object from the given JSON RPC response from the
         Solana node.
+
+        If the account data is the same as in the last applied response, only
+        the slot and lamports are updated and the data is not parsed again.
+
+        Set partial if the response may hold only the start of the account
+        data (it was requested with a data slice). A partial price account,
+        for example, has no price components.
         """
         super().update_with_rpc_response(slot, value)
         if "data" not in value:
@@ -133,17 +166,57 @@ class PythAccount(SolanaAccount):
             raise ValueError(f"invalid account data response from Solana for key {self.key}: {value}")
         data_base64, data_format = value["data"]
         _check_base64(data_format)
-        data = base64.b64decode(data_base64)
-        type_, size, version = _parse_header(data, 0, key=self.key)
+        if data_base64 == self._last_data_base64:
+            self.updates_skipped += 1
+            self._update_skipped()
+            return
+        if self._update_with_data(base64.b64decode(data_base64), partial=partial):
+            self._last_data_base64 = data_base64
+        else:
+            self._last_data_base64 = None
+
+    def update_with_data(self, slot: Optional[int], data: bytes) -> None:
+        """
+        Update the data in this object from raw Pyth account data (including
+        the account header) fetched at the given slot.
+        """
+        self.slot = slot
+        self._last_data_base64 = None
+        self._update_with_data(data)
+
+    def _update_with_data(self, data: bytes, *, partial: bool = False) -> bool:
+        type_, size, version = _parse_header(data, 0, key=self.key, partial=partial)
         class_ = _ACCOUNT_TYPE_TO_CLASS.get(type_, None)
         if class_ is not type(self):
             raise ValueError(
                 f"wrong Pyth account type {type_} for {type(self)}")
 
+        complete = len(data) >= size
+        data = data[:size]
         try:
-            self.update_from(data[:size], version=version, offset=ACCOUNT_HEADER_BYTES)
+            self.update_from(data, version=version, offset=ACCOUNT_HEADER_BYTES)
         except Exception as e:
             logger.exception("error while parsing account", exception=e)
+            self._data = None
+            return False
+        # partial data cannot be restored from, so it is not kept
+        self._data = data if complete else None
+        self.updates_applied += 1
+        return True
+
+    @property
+    def data(self) -> Optional[bytes]:
+        """
+        The raw account data (including the account header) of the last
+        update, or None if the account was not updated from complete raw
+        data.
+        """
+        return self._data
+
+    def _update_skipped(self) -> None:
+        # called when an RPC response is not parsed because the account data
+        # did not change
+        pass
 
 
 class PythMappingAccount(PythAccount):
@@ -172,20 +245,18 @@ class PythMappingAccount(PythAccount):
             unused (u32)
             next mapping account key (char[32])
         """
-        fmt = "<II32s"  # 32 == SolanaPublicKey.LENGTH
-
-        num_entries, _, next_account_key_bytes = struct.unpack_from(
-            fmt, buffer, offset)
+        num_entries, _, next_account_key_bytes = layouts.MAPPING_HEADER.unpack_from(
+            buffer, offset)
         next_account_key = _read_public_key_or_none(next_account_key_bytes)
 
         # product account keys (char[32] * number of products)
-        offset += struct.calcsize(fmt)
+        offset += layouts.MAPPING_HEADER.size
         entries: List[SolanaPublicKey] = []
         for _ in range(num_entries):
-            new_key = SolanaPublicKey(buffer[offset:offset + SolanaPublicKey.LENGTH])
+            new_key_bytes = buffer[offset:offset + SolanaPublicKey.LENGTH]
             # ignore null keys..
-            if new_key != SolanaPublicKey.NULL_KEY:
-                entries.append(SolanaPublicKey(buffer[offset:offset + SolanaPublicKey.LENGTH]))
+            if new_key_bytes != _NULL_KEY_BYTES:
+                entries.append(SolanaPublicKey.from_bytes(new_key_bytes))
             else:
                 logger.warning("null key seen in mapping account {}", self.key)
             offset += SolanaPublicKey.LENGTH
@@ -278,23 +349,7 @@ class PythProductAccount(PythAccount):
         if self._prices is None:
             prices = await self.refresh_prices()
             return list(prices.values()), []
-        old_prices = dict((price.key, price) for price in self._prices.values())
-        new_prices: Dict[PythPriceType, PythPriceAccount] = {}
-        added_prices: List[PythPriceAccount] = []
-        if update_accounts:
-            await self.solana.update_accounts([self, *old_prices.values()])
-        key = self.first_price_account_key
-        while key:
-            account = old_prices.pop(key, None)
-            if account is None:
-                account = PythPriceAccount(key, self.solana, product=self)
-                await account.update()
-                added_prices.append(account)
-            new_prices[account.price_type] = account
-            key = account.next_price_account_key
-
-        self._prices = new_prices
-        return added_prices, list(old_prices.values())
+        return await check_price_changes([self], update_accounts)
 
     def use_price_accounts(self, new_prices: List[PythPriceAccount]) -> None:
         """
@@ -330,11 +385,10 @@ class PythProductAccount(PythAccount):
             repeat until end of data or key is empty
         """
 
-        first_price_account_key_bytes = buffer[offset:offset +
-                                               SolanaPublicKey.LENGTH]
+        first_price_account_key_bytes, = layouts.PRODUCT_HEADER.unpack_from(buffer, offset)
         attrs = {}
 
-        offset += SolanaPublicKey.LENGTH
+        offset += layouts.PRODUCT_HEADER.size
         buffer_len = len(buffer)
         while offset < buffer_len:
             key, offset = _read_attribute_string(buffer, offset)
@@ -343,9 +397,8 @@ class PythProductAccount(PythAccount):
             value, offset = _read_attribute_string(buffer, offset)
             attrs[key] = value
 
-        self.first_price_account_key = SolanaPublicKey(first_price_account_key_bytes)
-        if self.first_price_account_key == SolanaPublicKey.NULL_KEY:
-            self.first_price_account_key = None
+        self.first_price_account_key = _read_public_key_or_none(first_price_account_key_bytes)
+        if self.first_price_account_key is None:
             self._prices = {}
         self.attrs: Dict[str, str] = attrs
 
@@ -361,6 +414,57 @@ class PythProductAccount(PythAccount):
                 yield key, val
 
 
+async def check_price_changes(
+    products: Sequence[PythProductAccount],
+    update_accounts: bool = True
+) -> Tuple[List[PythPriceAccount], List[PythPriceAccount]]:
+    """
+    Checks for changes to the lists of price accounts of many products, like
+    PythProductAccount.check_price_changes, but walks their price chains
+    together: the new price accounts found at each position of the chains
+    are fetched with one update_accounts call.
+
+    Returns a tuple of a list of added accounts, and a list of removed accounts.
+    """
+    if not products:
+        return [], []
+    solana = products[0].solana
+    old_prices = [
+        dict((price.key, price) for price in product._prices.values()) if product._prices else {}
+        for product in products
+    ]
+    new_prices: List[Dict[PythPriceType, PythPriceAccount]] = [{} for _ in products]
+    keys = [product.first_price_account_key for product in products]
+    added_prices: List[PythPriceAccount] = []
+    if update_accounts:
+        await solana.update_accounts([*products, *(price for prices in old_prices for price in prices.values())])
+
+    while True:
+        # follow each chain through known accounts up to the next new one
+        new_accounts: List[Tuple[int, PythPriceAccount]] = []
+        for i, product in enumerate(products):
+            key = keys[i]
+            while key:
+                account = old_prices[i].pop(key, None)
+                if account is None:
+                    new_accounts.append((i, PythPriceAccount(key, solana, product=product)))
+                    break
+                new_prices[i][account.price_type] = account
+                key = account.next_price_account_key
+            keys[i] = key
+        if not new_accounts:
+            break
+        await solana.update_accounts([account for _, account in new_accounts])
+        for i, account in new_accounts:
+            added_prices.append(account)
+            new_prices[i][account.price_type] = account
+            keys[i] = account.next_price_account_key
+
+    for product, prices in zip(products, new_prices):
+        product._prices = prices
+    return added_prices, [price for prices in old_prices for price in prices.values()]
+
+
 @dataclass
 class PythPriceInfo:
     """
@@ -405,8 +509,8 @@ class PythPriceInfo:
             slot (u64)
         """
         # _ is corporate_action
-        price, confidence_interval, price_status, _, pub_slot = struct.unpack_from(
-            "<qQIIQ", buffer, offset)
+        price, confidence_interval, price_status, _, pub_slot = layouts.PRICE_INFO.unpack_from(
+            buffer, offset)
         return PythPriceInfo(price, confidence_interval, PythPriceStatus(price_status), pub_slot, exponent)
 
     def __str__(self) -> str:
@@ -449,15 +553,113 @@ class PythPriceComponent:
             contributing price to last aggregate (PythPriceInfo)
             latest contributing price (PythPriceInfo)
         """
-        key = _read_public_key_or_none(buffer, offset)
+        (key_bytes,
+         last_price, last_conf, last_status, _, last_pub_slot,
+         latest_price, latest_conf, latest_status, _, latest_pub_slot) = layouts.PRICE_COMPONENT.unpack_from(buffer, offset)
+        key = _read_public_key_or_none(key_bytes)
         if key is None:
             return None
-        offset += SolanaPublicKey.LENGTH
-        last_aggregate_price = PythPriceInfo.deserialise(
-            buffer, offset, exponent=exponent)
-        offset += PythPriceInfo.LENGTH
-        latest_price = PythPriceInfo.deserialise(buffer, offset, exponent=exponent)
-        return PythPriceComponent(key, last_aggregate_price, latest_price, exponent)
+        last_aggregate_price_info = PythPriceInfo(
+            last_price, last_conf, PythPriceStatus(last_status), last_pub_slot, exponent)
+        latest_price_info = PythPriceInfo(
+            latest_price, latest_conf, PythPriceStatus(latest_status), latest_pub_slot, exponent)
+        return PythPriceComponent(key, last_aggregate_price_info, latest_price_info, exponent)
+
+
+class PythPriceComponents(Sequence[PythPriceComponent]):
+    """
+    A read-only sequence of the price components of a price account, backed by
+    the raw account data. Each component is decoded the first time it is
+    accessed.
+    """
+
+    def __init__(self, buffer: bytes, offset: int, *, exponent: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._exponent = exponent
+        # the components end at the first null publisher key (or end of data)
+        count = 0
+        buffer_len = len(buffer)
+        while offset + PythPriceComponent.LENGTH <= buffer_len and \
+                buffer[offset:offset + SolanaPublicKey.LENGTH] != _NULL_KEY_BYTES:
+            count += 1
+            offset += PythPriceComponent.LENGTH
+        self._components: List[Optional[PythPriceComponent]] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    @overload
+    def __getitem__(self, index: int) -> PythPriceComponent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PythPriceComponent]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PythPriceComponent, List[PythPriceComponent]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        component = self._components[index]
+        if component is None:
+            if index < 0:
+                index += len(self._components)
+            component = PythPriceComponent.deserialise(
+                self._buffer, self._offset + index * PythPriceComponent.LENGTH, exponent=self._exponent)
+            assert component is not None
+            self._components[index] = component
+        return component
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (PythPriceComponents, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"PythPriceComponents({list(self)})"
+
+
+@dataclass(frozen=True)
+class PythPriceChange:
+    """
+    Describes what changed in a price account in its last update.
+
+    The first update of an account reports everything as changed; an update
+    with identical account data reports nothing as changed.
+
+    Attributes:
+        price (bool): whether the raw aggregate price changed
+        confidence_interval (bool): whether the raw aggregate confidence
+            interval changed
+        price_status (bool): whether the aggregate price status changed
+        valid_slot (bool): whether the slot of the aggregate price changed
+        components (Tuple[int, ...]): indices of the price components whose
+            data changed, including components that were added or removed
+    """
+
+    price: bool = False
+    confidence_interval: bool = False
+    price_status: bool = False
+    valid_slot: bool = False
+    components: Tuple[int, ...] = ()
+
+    def __bool__(self) -> bool:
+        return self.price or self.confidence_interval or self.price_status or self.valid_slot or bool(self.components)
+
+
+_NO_PRICE_CHANGE = PythPriceChange()
+
+
+def _changed_components(old: bytes, new: bytes) -> Tuple[int, ...]:
+    if old == new:
+        return ()
+    length = PythPriceComponent.LENGTH
+    old_count = len(old) // length
+    new_count = len(new) // length
+    changed = []
+    for i in range(max(old_count, new_count)):
+        start = i * length
+        if i >= old_count or i >= new_count or old[start:start + length] != new[start:start + length]:
+            changed.append(i)
+    return tuple(changed)
 
 
 class PythPriceAccount(PythAccount):
@@ -478,16 +680,23 @@ class PythPriceAccount(PythAccount):
         aggregator_key (SolanaPublicKey): the public key of the quoter who computed
             the last aggregate price
         aggregate_price_info (PythPriceInfo): the aggregate price information
-        price_components (List[PythPriceComponent]): the price components that the
-            aggregate price is composed of
+        price_components (Sequence[PythPriceComponent]): the price components that the
+            aggregate price is composed of; a lazily decoded PythPriceComponents
+            if lazy_components is set
         slot (int): the slot time when this account was last fetched
         product (Optional[PythProductAccount]): the product this price is for, if loaded
         max_latency (int): the maximum allowed slot difference for this feed
+        lazy_components (bool): whether price components are decoded only when
+            accessed; defaults to config.LAZY_PRICE_COMPONENTS
+        last_change (Optional[PythPriceChange]): what changed in the last
+            update, or None if the account was never updated
     """
 
-    def __init__(self, key: SolanaPublicKey, solana: SolanaClient, *, product: Optional[PythProductAccount] = None) -> None:
+    def __init__(self, key: SolanaPublicKey, solana: SolanaClient, *, product: Optional[PythProductAccount] = None,
+                 lazy_components: Optional[bool] = None) -> None:
         super().__init__(key, solana)
         self.product = product
+        self.lazy_components: bool = config.LAZY_PRICE_COMPONENTS if lazy_components is None else lazy_components
         self.price_type = PythPriceType.UNKNOWN
         self.exponent: Optional[int] = None
         self.num_components: int = 0
@@ -496,7 +705,7 @@ class PythPriceAccount(PythAccount):
         self.product_account_key: Optional[SolanaPublicKey] = None
         self.next_price_account_key: Optional[SolanaPublicKey] = None
         self.aggregate_price_info: Optional[PythPriceInfo] = None
-        self.price_components: List[PythPriceComponent] = []
+        self.price_components: Sequence[PythPriceComponent] = []
         self.derivations: Dict[EmaType, int] = {}
         self.timestamp: int = 0  # unix timestamp in seconds
         self.min_publishers: Optional[int] = None
@@ -505,6 +714,9 @@ class PythPriceAccount(PythAccount):
         self.prev_conf: float = field(init=False)
         self.prev_timestamp: int = 0  # unix timestamp in seconds
         self.max_latency: int = 0 # maximum allowed slot difference for this feed
+        self.last_change: Optional[PythPriceChange] = None
+        # raw data of the price components of the last update
+        self._components_data: Optional[bytes] = None
 
     @property
     def aggregate_price(self) -> Optional[float]:
@@ -566,55 +778,67 @@ class PythPriceAccount(PythAccount):
             price components (PythPriceComponent[up to 16 (v1) / up to 32 (v2)])
         """
         if version == _VERSION_2:
-            price_type, exponent, num_components = struct.unpack_from("<IiI", buffer, offset)
-            offset += 16  # struct.calcsize("IiII") (last I is the number of quoters that make up the aggregate)
-            last_slot, valid_slot = struct.unpack_from("<QQ", buffer, offset)
-            offset += 16  # struct.calcsize("QQ")
-            derivations = list(struct.unpack_from("<6q", buffer, offset))
+            (price_type, exponent, num_components, _num_quoters, last_slot, valid_slot,
+             *derivations, timestamp, min_publishers, _message_sent, max_latency, _drv_3, _drv_4,
+             product_account_key_bytes, next_price_account_key_bytes,
+             prev_slot, prev_price, prev_conf, prev_timestamp,
+             agg_price, agg_conf, agg_status, _, agg_pub_slot) = layouts.PRICE_V2_WITH_AGGREGATE.unpack_from(buffer, offset)
             self.derivations = dict((type_, derivations[type_.value - 1]) for type_ in [EmaType.EMA_CONFIDENCE_VALUE, EmaType.EMA_PRICE_VALUE])
-            offset += 48  # struct.calcsize("6q")
-            timestamp, min_publishers = struct.unpack_from("<qB", buffer, offset)
-            offset += 9  # struct.calcsize("qB")
-            _message_sent, max_latency = struct.unpack_from("<bB", buffer, offset)
-            offset += 2  # struct.calcsize("bB")
-            _drv_3, _drv_4 = struct.unpack_from("<bi", buffer, offset)
-            offset += 5  # struct.calcsize("bi")
-            product_account_key_bytes, next_price_account_key_bytes = struct.unpack_from("32s32s", buffer, offset)
-            offset += 64  # struct.calcsize("32s32s")
-            prev_slot, prev_price, prev_conf, prev_timestamp = struct.unpack_from("<QqQq", buffer, offset)
-            offset += 32  # struct.calcsize("QqQq")
+            offset += layouts.PRICE_V2_WITH_AGGREGATE.size
             prev_price *= (10 ** exponent)
             prev_conf *= (10 ** exponent)
         elif version == _VERSION_1:
-            price_type, exponent, num_components, _, last_slot, valid_slot, product_account_key_bytes, next_price_account_key_bytes, aggregator_key_bytes = struct.unpack_from(
-                "<IiIIQQ32s32s32s", buffer, offset)
+            (price_type, exponent, num_components, _, last_slot, valid_slot,
+             product_account_key_bytes, next_price_account_key_bytes, _aggregator_key_bytes,
+             agg_price, agg_conf, agg_status, _, agg_pub_slot) = layouts.PRICE_V1_WITH_AGGREGATE.unpack_from(buffer, offset)
             self.derivations = {}
-            offset += 128  # struct.calcsize("<IiIIQQ32s32s32s")
+            offset += layouts.PRICE_V1_WITH_AGGREGATE.size
+            # v1 accounts carry none of the v2-only fields
+            timestamp, min_publishers, max_latency = 0, None, 0
+            prev_slot, prev_price, prev_conf, prev_timestamp = 0, 0, 0, 0
         else:
             assert False
 
         # aggregate price info (PythPriceInfo)
-        aggregate_price_info = PythPriceInfo.deserialise(
-            buffer, offset, exponent=exponent)
+        aggregate_price_info = PythPriceInfo(
+            agg_price, agg_conf, PythPriceStatus(agg_status), agg_pub_slot, exponent)
 
         # price components (PythPriceComponent[up to 16 (v1) / up to 32 (v2)])
-        price_components: List[PythPriceComponent] = []
-        offset += PythPriceInfo.LENGTH
-        buffer_len = len(buffer)
-        while offset < buffer_len:
-            component = PythPriceComponent.deserialise(
-                buffer, offset, exponent=exponent)
-            if not component:
-                break
-            price_components.append(component)
-            offset += PythPriceComponent.LENGTH
+        price_components: Sequence[PythPriceComponent] = PythPriceComponents(buffer, offset, exponent=exponent)
+        components_data = bytes(buffer[offset:offset + len(price_components) * PythPriceComponent.LENGTH])
+        if not self.lazy_components:
+            price_components = list(price_components)
+
+        # partial data (from a data slice) stops before the components, so
+        # whether they changed is unknown
+        partial = len(buffer) < offset + num_components * PythPriceComponent.LENGTH
+        changed_components: Tuple[int, ...]
+        if partial:
+            changed_components = ()
+        elif self._components_data is None:
+            changed_components = tuple(range(len(price_components)))
+        else:
+            changed_components = _changed_components(self._components_data, components_data)
+        previous = self.aggregate_price_info
+        if previous is None:
+            self.last_change = PythPriceChange(True, True, True, True, changed_components)
+        else:
+            self.last_change = PythPriceChange(
+                previous.raw_price != agg_price,
+                previous.raw_confidence_interval != agg_conf,
+                previous.price_status != aggregate_price_info.price_status,
+                self.valid_slot != valid_slot,
+                changed_components,
+            )
+        if not partial:
+            self._components_data = components_data
 
         self.price_type = PythPriceType(price_type)
         self.exponent = exponent
         self.num_components = num_components
         self.last_slot = last_slot
         self.valid_slot = valid_slot
-        self.product_account_key = SolanaPublicKey(product_account_key_bytes)
+        self.product_account_key = SolanaPublicKey.from_bytes(product_account_key_bytes)
         self.next_price_account_key = _read_public_key_or_none(
             next_price_account_key_bytes)
         self.aggregate_price_info = aggregate_price_info
@@ -628,6 +852,9 @@ class PythPriceAccount(PythAccount):
         # a max latency of 0 is the default max latency
         self.max_latency = max_latency if max_latency != 0 else DEFAULT_MAX_LATENCY
 
+    def _update_skipped(self) -> None:
+        self.last_change = _NO_PRICE_CHANGE
+
     def __str__(self) -> str:
         if self.product:
             return f"PythPriceAccount {self.product.symbol} {self.price_type} ({self.key})"
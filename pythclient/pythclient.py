@@ -2,17 +2,36 @@
 
 from __future__ import annotations
 from asyncio.futures import Future
-from typing import List, Optional, Union, Any, Dict, Coroutine, Tuple, Iterable
+from typing import TYPE_CHECKING, List, Optional, Union, Any, AsyncIterator, Awaitable, Callable, Dict, Coroutine, Sequence, Set, Tuple, Iterable
 from typing_extensions import Literal
 import asyncio
+import itertools
+import sys
 
 import aiohttp
 import backoff
 from loguru import logger
 
-from .solana import SolanaAccount, SolanaClient, SolanaPublicKey, SOLANA_DEVNET_HTTP_ENDPOINT, SOLANA_DEVNET_WS_ENDPOINT, SolanaPublicKeyOrStr
-from .pythaccounts import PythAccount, PythMappingAccount, PythProductAccount, PythPriceAccount
-from . import exceptions, config, ratelimit
+from .solana import SolanaAccount, SolanaClient, SolanaPublicKey, SOLANA_DEVNET_HTTP_ENDPOINT, SOLANA_DEVNET_WS_ENDPOINT, SolanaPublicKeyOrStr, MAX_MULTIPLE_ACCOUNTS
+from .pythaccounts import (
+    PRICE_AGGREGATE_DATA_LENGTH,
+    PythAccount,
+    PythAccountType,
+    PythMappingAccount,
+    PythProductAccount,
+    PythPriceAccount,
+    account_type_filter,
+)
+from .pricebatch import PythPriceBatch
+from .pricestore import PythPriceSink, update_price_sink
+from .revalidation import PythRevalidation
+from .snapshot import PythSnapshot, write_snapshot
+from . import codec, exceptions, config, ratelimit
+
+if TYPE_CHECKING:
+    from .shardedwatch import ShardedWatchSession
+
+DEFAULT_MAX_IN_FLIGHT_SUBSCRIPTIONS = 100
 
 
 class PythClient:
@@ -22,7 +41,16 @@ class PythClient:
                  solana_ws_endpoint: str = SOLANA_DEVNET_WS_ENDPOINT,
                  first_mapping_account_key: str,
                  program_key: Optional[str] = None,
-                 aiohttp_client_session: Optional[aiohttp.ClientSession] = None) -> None:
+                 aiohttp_client_session: Optional[aiohttp.ClientSession] = None,
+                 price_store: Optional[PythPriceSink] = None) -> None:
+        """
+        Args:
+            price_store (Optional[PythPriceSink]): a PythPriceStore (or
+                sharedprices.SharedPriceTable) that refresh_all_prices and
+                watch sessions created by this client write price updates
+                into
+        """
+        self.price_store = price_store
         self._first_mapping_account_key = SolanaPublicKey(first_mapping_account_key)
         self._program_key = program_key and SolanaPublicKey(program_key)
         self.solana = solana_client or SolanaClient(endpoint=solana_endpoint, ws_endpoint=solana_ws_endpoint, client=aiohttp_client_session)
@@ -62,6 +90,42 @@ class PythClient:
             slot, account_json = None, None
 
         products = await self.get_products()
+        if account_json is not None:
+            assert slot
+            program_slot, program_accounts = slot, account_json
+
+            async def update_prices(prices: List[PythPriceAccount]) -> None:
+                for price in prices:
+                    p_data = program_accounts.get(str(price.key))
+                    if p_data is None:
+                        raise exceptions.MissingAccountException(f"need account {price.key} but missing in getProgramAccount response")
+                    price.update_with_rpc_response(program_slot, p_data)
+
+            await self._load_price_chains(products, update_prices)
+        else:
+            await self._load_price_chains(products, self.solana.update_accounts)
+
+    @backoff.on_exception(
+        backoff.fibo,
+        (aiohttp.ClientError, exceptions.RateLimitedException),
+        max_tries=config.get_backoff_max_tries,
+        max_value=config.get_backoff_max_value,
+    )
+    async def load_prices(self, products: Iterable[PythProductAccount]) -> None:
+        """
+        Loads the price accounts of the given products.
+
+        Unlike calling PythProductAccount.refresh_prices on each product, the
+        price chains of all products are walked together, one level at a
+        time, fetching each level with getMultipleAccounts.
+        """
+        await self._load_price_chains(products, self.solana.update_accounts)
+
+    async def _load_price_chains(
+        self,
+        products: Iterable[PythProductAccount],
+        update_prices: Callable[[List[PythPriceAccount]], Awaitable[Any]],
+    ) -> None:
         tuples: List[Tuple[PythProductAccount, List[PythPriceAccount], PythPriceAccount]] = [
             (product, [], PythPriceAccount(product.first_price_account_key, self.solana, product=product))
                 for product in products
@@ -69,19 +133,13 @@ class PythClient:
         ]
 
         while len(tuples) > 0:
-            if account_json is not None:
-                assert slot
-                for _, _, price in tuples:
-                    p_data = account_json.get(str(price.key))
-                    if p_data is None:
-                        raise exceptions.MissingAccountException(f"need account {price.key} but missing in getProgramAccount response")
-                    price.update_with_rpc_response(slot, p_data)
-            else:
-                await self.solana.update_accounts([price for _, _, price in tuples])
+            await update_prices([price for _, _, price in tuples])
 
             next_tuples: List[Tuple[PythProductAccount, List[PythPriceAccount], PythPriceAccount]] = []
             for product, prices, price in tuples:
                 prices.append(price)
+                if self.price_store is not None:
+                    update_price_sink(self.price_store, price)
                 if price.next_price_account_key:
                     next_tuples.append((product, prices, PythPriceAccount(price.next_price_account_key, self.solana, product=product)))
                 else:
@@ -108,8 +166,173 @@ class PythClient:
 
         return slot, account_json
 
+    @backoff.on_exception(
+        backoff.fibo,
+        (aiohttp.ClientError, exceptions.RateLimitedException),
+        max_tries=config.get_backoff_max_tries,
+        max_value=config.get_backoff_max_value,
+    )
+    async def get_price_batch(self, *, aggregate_only: bool = False) -> PythPriceBatch:
+        """
+        Fetches all price accounts of the program in one getProgramAccounts call
+        and decodes them column-wise, without building per-account objects.
+
+        Only price accounts are requested from the RPC node. If aggregate_only
+        is set, only the data up to the aggregate price info is requested, so
+        price accounts built from the batch have no price components.
+        """
+        if not self._program_key:
+            raise ValueError("program_key is required to fetch a price batch")
+        resp = await self.solana.get_program_accounts(
+            self._program_key,
+            with_context=True,
+            filters=[account_type_filter(PythAccountType.PRICE)],
+            data_slice=(0, PRICE_AGGREGATE_DATA_LENGTH) if aggregate_only else None,
+        )
+        return PythPriceBatch.from_program_accounts(resp, partial=aggregate_only)
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Saves the raw data of the mapping, product and price accounts loaded
+        so far to a snapshot file, which load_snapshot can restore them from.
+
+        Returns the number of accounts saved.
+        """
+        accounts: List[PythAccount] = []
+        accounts.extend(self._mapping_accounts or [])
+        for product in self._products or []:
+            accounts.append(product)
+            try:
+                accounts.extend(product.prices.values())
+            except exceptions.NotLoadedException:
+                pass
+        return write_snapshot(path, accounts)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Restores the mapping, product and price accounts from a snapshot file
+        written by save_snapshot, without any RPC calls. The accounts are as
+        of the slot each was saved at.
+
+        Raises MissingAccountException if the snapshot does not contain every
+        account reachable from the first mapping account.
+
+        Returns the highest slot of any account in the snapshot.
+        """
+        with PythSnapshot(path) as snapshot:
+            def load(account: PythAccount) -> None:
+                if not snapshot.load(account):
+                    raise exceptions.MissingAccountException(f"need account {account.key} but missing in snapshot {path}")
+
+            mapping_accounts: List[PythMappingAccount] = []
+            key: Optional[SolanaPublicKey] = self._first_mapping_account_key
+            while key:
+                mapping = PythMappingAccount(key, self.solana)
+                load(mapping)
+                mapping_accounts.append(mapping)
+                key = mapping.next_account_key
+
+            products: List[PythProductAccount] = []
+            for mapping in mapping_accounts:
+                for product_key in mapping.entries:
+                    product = PythProductAccount(product_key, self.solana)
+                    load(product)
+                    prices: List[PythPriceAccount] = []
+                    key = product.first_price_account_key
+                    while key:
+                        price = PythPriceAccount(key, self.solana, product=product)
+                        load(price)
+                        prices.append(price)
+                        if self.price_store is not None:
+                            update_price_sink(self.price_store, price)
+                        key = price.next_price_account_key
+                    product.use_price_accounts(prices)
+                    products.append(product)
+
+            self._mapping_accounts = mapping_accounts
+            self._products = products
+            return snapshot.slot
+
+    def revalidate(self, priority: Iterable[SolanaPublicKeyOrStr] = ()) -> PythRevalidation:
+        """
+        Starts refreshing every loaded account in the background, for example
+        after load_snapshot, and returns the running PythRevalidation.
+
+        The price accounts whose keys are in priority (such as
+        WatchSession.subscribed_keys) are refreshed first, then mapping and
+        product changes are reconciled and all other accounts refreshed.
+        Cached accounts stay usable throughout; await the revalidation's
+        ready task to know when they are all current.
+
+        If nothing is loaded yet, everything is loaded as by
+        refresh_all_prices.
+        """
+        return PythRevalidation(self, priority)
+
+    async def program_subscribe_prices(self, session: WatchSession, *, aggregate_only: bool = True) -> None:
+        """
+        Subscribes the given watch session to updates of every loaded price
+        account with a single programSubscribe, filtered on the RPC node to
+        price accounts only.
+
+        If aggregate_only is set, only the data up to the aggregate price info
+        is sent with each update, so the price accounts' components are not
+        kept up to date (they become empty on their first update).
+        """
+        if not self._program_key:
+            raise ValueError("program_key is required to subscribe to prices")
+        products = await self.get_products()
+        await self.load_prices([product for product in products if product._prices is None])
+        prices = [price for product in products for price in product.prices.values()]
+        await session.program_subscribe(
+            self._program_key,
+            prices,
+            filters=[account_type_filter(PythAccountType.PRICE)],
+            data_slice=(0, PRICE_AGGREGATE_DATA_LENGTH) if aggregate_only else None,
+        )
+
     def create_watch_session(self):
-        return WatchSession(self.solana)
+        return WatchSession(self.solana, price_store=self.price_store)
+
+    def create_sharded_watch_session(
+        self,
+        shards: int,
+        ws_endpoints: Optional[Sequence[str]] = None,
+        *,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_SUBSCRIPTIONS,
+        conflate: bool = False,
+        max_concurrent_requests: Optional[int] = None,
+        max_batch_requests: Optional[int] = None,
+        update_queue_size: Optional[int] = None,
+        update_queue_policy: Optional[str] = None,
+    ) -> ShardedWatchSession:
+        """
+        Creates a watch session spreading its subscriptions across the given
+        number of WebSocket connections, assigned round-robin to ws_endpoints
+        (defaults to this client's WebSocket endpoint).
+
+        max_in_flight and conflate are passed to each shard's WatchSession;
+        the other settings of the shards' SolanaClients default to those of
+        this client's.
+        """
+        from .shardedwatch import ShardedWatchSession
+
+        solana = self.solana
+        endpoints = ws_endpoints or [solana.ws_endpoint]
+        clients = [
+            SolanaClient(
+                ratelimit=solana.ratelimit,
+                client=solana._client,
+                endpoint=solana.endpoint,
+                ws_endpoint=endpoints[i % len(endpoints)],
+                max_concurrent_requests=solana.max_concurrent_requests if max_concurrent_requests is None else max_concurrent_requests,
+                max_batch_requests=solana.max_batch_requests if max_batch_requests is None else max_batch_requests,
+                update_queue_size=solana.update_queue_size if update_queue_size is None else update_queue_size,
+                update_queue_policy=solana.update_queue_policy if update_queue_policy is None else update_queue_policy,
+            )
+            for i in range(shards)
+        ]
+        return ShardedWatchSession(clients, max_in_flight=max_in_flight, price_store=self.price_store, conflate=conflate)
 
     async def close(self):
         await self.solana.close()
@@ -127,8 +350,11 @@ class PythClient:
         max_value=config.get_backoff_max_value,
     )
     async def _refresh_products(self, *, update_accounts: bool = True, account_json: Optional[Dict[str, Any]] = None, slot: Optional[int] = None) -> List[PythProductAccount]:
+        # products fetched while walking the mapping accounts
+        prefetched: Dict[SolanaPublicKey, PythProductAccount] = {}
         if update_accounts or not self._mapping_accounts:
-            await self._refresh_mapping_accounts()
+            await self._refresh_mapping_accounts(
+                prefetch_products=prefetched if account_json is None and update_accounts else None)
         assert self._mapping_accounts is not None
 
         product_account_keys: List[SolanaPublicKey] = []
@@ -139,7 +365,7 @@ class PythClient:
 
         products: List[PythProductAccount] = []
         for k in product_account_keys:
-            product = existing_products.get(k) or PythProductAccount(k, self.solana)
+            product = prefetched.get(k) or existing_products.get(k) or PythProductAccount(k, self.solana)
             if account_json is not None:
                 p_data = account_json.get(str(k))
                 if p_data is None:
@@ -148,7 +374,7 @@ class PythClient:
                 product.update_with_rpc_response(slot, p_data)
             products.append(product)
         if account_json is None and update_accounts:
-            await self.solana.update_accounts(products)
+            await self.solana.update_accounts([product for product in products if product.key not in prefetched])
         self._products = products
         return self._products
 
@@ -160,7 +386,9 @@ class PythClient:
     async def get_all_accounts(self) -> List[PythAccount]:
         accounts: List[PythAccount] = []
         accounts.extend(await self.get_mapping_accounts())
-        for product in await self.get_products():
+        products = await self.get_products()
+        await self.load_prices([product for product in products if product._prices is None])
+        for product in products:
             accounts.append(product)
             accounts.extend((await product.get_prices()).values())
         return accounts
@@ -171,10 +399,27 @@ class PythClient:
         max_tries=config.get_backoff_max_tries,
         max_value=config.get_backoff_max_value,
     )
-    async def _refresh_mapping_accounts(self, *, account_json: Optional[Dict[str, Any]] = None, slot: Optional[int] = None) -> List[PythMappingAccount]:
+    async def _refresh_mapping_accounts(
+        self,
+        *,
+        account_json: Optional[Dict[str, Any]] = None,
+        slot: Optional[int] = None,
+        prefetch_products: Optional[Dict[SolanaPublicKey, PythProductAccount]] = None,
+    ) -> List[PythMappingAccount]:
+        # If prefetch_products is given, each mapping account that has to be
+        # fetched is fetched together with product accounts listed by the
+        # mapping accounts before it, which are added to prefetch_products.
         key = self._first_mapping_account_key
 
         existing_mappings = dict((mapping.key, mapping) for mapping in self._mapping_accounts) if self._mapping_accounts else {}
+        existing_products = dict((product.key, product) for product in self._products) if self._products else {}
+        # products listed by the mapping accounts walked so far, not fetched yet
+        pending_products: List[PythProductAccount] = []
+
+        # refresh the mapping accounts we already know about together, then
+        # only fetch the ones that were added to the chain
+        if account_json is None and existing_mappings:
+            await self.solana.update_accounts(list(existing_mappings.values()))
 
         mapping_accounts: List[PythMappingAccount] = []
         while key:
@@ -185,8 +430,17 @@ class PythClient:
                     raise exceptions.MissingAccountException(f"need account {key} but missing in getProgramAccount response")
                 assert slot
                 m.update_with_rpc_response(slot, m_data)
-            else:
-                await m.update()
+            elif key not in existing_mappings:
+                if not pending_products:
+                    await m.update()
+                else:
+                    products = pending_products[:MAX_MULTIPLE_ACCOUNTS - 1]
+                    del pending_products[:len(products)]
+                    await self.solana.update_accounts([m, *products])
+                    prefetch_products.update((product.key, product) for product in products)
+            if prefetch_products is not None:
+                pending_products.extend(
+                    existing_products.get(k) or PythProductAccount(k, self.solana) for k in m.entries)
             mapping_accounts.append(m)
             key = m.next_account_key
         self._mapping_accounts = mapping_accounts
@@ -206,8 +460,7 @@ class PythClient:
         new_accounts = dict((product.key, product) for product in [*self._mapping_accounts, *self._products])
         added_keys = new_accounts.keys() - old_accounts.keys()
         removed_keys = old_accounts.keys() - new_accounts.keys()
-        for new_key in added_keys:
-            await new_accounts[new_key].update()
+        await self.solana.update_accounts([new_accounts[new_key] for new_key in added_keys])
 
         return list(new_accounts[key] for key in added_keys), list(old_accounts[key] for key in removed_keys)
 
@@ -217,9 +470,30 @@ def _WatchSession_reconnect_giveup(e: BaseException):
 
 
 class WatchSession:
-    def __init__(self, client: SolanaClient):
+    def __init__(self, client: SolanaClient, *, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_SUBSCRIPTIONS,
+                 price_store: Optional[PythPriceSink] = None, conflate: bool = False):
+        """
+        Args:
+            client (SolanaClient): the Solana client whose WebSocket is used
+            max_in_flight (int): the default number of subscribe/unsubscribe
+                requests subscribe_many, unsubscribe_many and reconnect keep in
+                flight at once
+            price_store (Optional[PythPriceSink]): a PythPriceStore (or
+                sharedprices.SharedPriceTable) that price account updates are
+                written into
+            conflate (bool): keep only the latest pending update of each
+                subscription and account, so updates superseded before they
+                are consumed are never parsed
+        """
         self._client = client
+        self.conflate = conflate
+        # the latest pending notification of each subscription and account
+        # when conflating, oldest first
+        self._conflated: Dict[Tuple[int, Optional[str]], codec.AccountNotification] = {}
+        self.updates_conflated = 0
         self._connected = False
+        self.max_in_flight = max_in_flight
+        self.price_store = price_store
 
         self._pending_sub: Dict[str, SolanaAccount] = {}
         self._subid_to_account: Dict[int, SolanaAccount] = {}
@@ -228,9 +502,18 @@ class WatchSession:
         self._pending_program_sub: Dict[str, Dict[str, SolanaAccount]] = {}
         self._subid_to_program_accounts: Dict[int, Dict[str, SolanaAccount]] = {}
         self._programkey_to_subid: Dict[str, int] = {}
+        # filters and data slice of each program subscription
+        self._program_sub_options: Dict[str, Tuple[Optional[List[Dict[str, Any]]], Optional[Tuple[int, int]]]] = {}
+        # program subscriptions which only get a slice of the account data
+        self._partial_subids: Set[int] = set()
         self._request_id = 1
         self._reconnect_future: Optional[Future[Any]] = None
 
+    @property
+    def subscribed_keys(self) -> List[str]:
+        """The keys of the accounts subscribed to with subscribe."""
+        return [*self._accountkey_to_subid.keys(), *self._pending_sub.keys()]
+
     def _next_subid(self) -> int:
         id = self._request_id
         self._request_id += 1
@@ -258,8 +541,11 @@ class WatchSession:
             self._pending_sub = {}
             self._subid_to_account = {}
             self._accountkey_to_subid = {}
-            for account in resubscribe_accounts:
-                await self._subscribe(account, True)
+            # the subscription ids of pending notifications are no longer valid
+            self._conflated = {}
+            succeeded, failed = await self._subscribe_many(resubscribe_accounts, None, True)
+            if failed:
+                logger.warning("failed to resubscribe to {} of {} accounts", failed, succeeded + failed)
             logger.debug("resubscribed")
 
             resubscribe_programs: List[Tuple[str, Dict[str, SolanaAccount]]] = []
@@ -269,8 +555,10 @@ class WatchSession:
             self._pending_program_sub = {}
             self._programkey_to_subid = {}
             self._subid_to_program_accounts = {}
+            self._partial_subids = set()
             for key, accounts in resubscribe_programs:
-                await self._program_subscribe(key, accounts.values(), True)
+                filters, data_slice = self._program_sub_options.get(key, (None, None))
+                await self._program_subscribe(key, accounts.values(), True, filters=filters, data_slice=data_slice)
             logger.debug("resubscribed")
         finally:
             if self._reconnect_future:
@@ -289,11 +577,11 @@ class WatchSession:
             logger.exception("exception while disconnecting WebSocket", exception=e)
             pass
 
-    async def _subscribe(self, account: SolanaAccount, reconnecting: bool = False):
+    async def _subscribe(self, account: SolanaAccount, reconnecting: bool = False) -> bool:
         try:
             keystr = str(account.key)
-            if keystr in self._accountkey_to_subid:
-                return
+            if keystr in self._accountkey_to_subid or keystr in self._pending_sub:
+                return True
             logger.trace("subscribing to {}...", keystr)
             self._pending_sub[keystr] = account
             subid = await self._client.ws_account_subscribe(keystr)
@@ -301,33 +589,96 @@ class WatchSession:
             del self._pending_sub[keystr]
             self._accountkey_to_subid[keystr] = subid
             self._subid_to_account[subid] = account
+            return True
         except Exception as e:
             if isinstance(e, asyncio.CancelledError):
                 raise
             logger.exception("exception while subscribing to account", exception=e)
             if not reconnecting:
                 await self.reconnect()
+            return False
 
     def subscribe(self, account: SolanaAccount):
         return self._subscribe(account)
 
-    async def unsubscribe(self, account: SolanaAccount):
+    async def _subscribe_many(self, accounts: Iterable[SolanaAccount], max_in_flight: Optional[int], reconnecting: bool) -> Tuple[int, int]:
+        semaphore = asyncio.Semaphore(max(max_in_flight or self.max_in_flight, 1))
+
+        async def subscribe_one(account: SolanaAccount) -> bool:
+            async with semaphore:
+                # failures are handled with one reconnect for the whole batch
+                return await self._subscribe(account, True)
+
+        results = await asyncio.gather(*(subscribe_one(account) for account in accounts))
+        succeeded = sum(results)
+        failed = len(results) - succeeded
+        if failed and not reconnecting:
+            await self.reconnect()
+        return succeeded, failed
+
+    def subscribe_many(self, accounts: Iterable[SolanaAccount], max_in_flight: Optional[int] = None) -> Coroutine[Any, Any, Tuple[int, int]]:
+        """
+        Subscribes to many accounts, keeping up to max_in_flight (defaults to
+        self.max_in_flight) subscription requests in flight at once.
+
+        Returns a tuple of the number of accounts subscribed and the number of
+        accounts that failed; failed accounts are retried by the reconnect that
+        follows a failure.
+        """
+        return self._subscribe_many(accounts, max_in_flight, False)
+
+    async def _unsubscribe(self, account: SolanaAccount, reconnecting: bool = False) -> bool:
         keystr = str(account.key)
         subid = self._accountkey_to_subid.pop(keystr, None)
         if subid is None:
-            return
+            return True
         del self._subid_to_account[subid]
         try:
             logger.trace("unsubscribing from {} with subid {}...", keystr, subid)
             await self._client.ws_account_unsubscribe(subid)
             logger.trace("unsubscribed from {}", keystr)
+            return True
         except Exception as e:
             if isinstance(e, asyncio.CancelledError):
                 raise
             logger.exception("exception while unsubscribing from account", exception=e)
-            await self.reconnect()
+            if not reconnecting:
+                await self.reconnect()
+            return False
 
-    async def _program_subscribe(self, programkey: SolanaPublicKeyOrStr, accounts: Iterable[SolanaAccount], reconnecting: bool = False):
+    async def unsubscribe(self, account: SolanaAccount):
+        await self._unsubscribe(account)
+
+    async def unsubscribe_many(self, accounts: Iterable[SolanaAccount], max_in_flight: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Unsubscribes from many accounts, keeping up to max_in_flight (defaults
+        to self.max_in_flight) requests in flight at once.
+
+        Returns a tuple of the number of accounts unsubscribed and the number
+        of accounts that failed.
+        """
+        semaphore = asyncio.Semaphore(max(max_in_flight or self.max_in_flight, 1))
+
+        async def unsubscribe_one(account: SolanaAccount) -> bool:
+            async with semaphore:
+                return await self._unsubscribe(account, True)
+
+        results = await asyncio.gather(*(unsubscribe_one(account) for account in accounts))
+        succeeded = sum(results)
+        failed = len(results) - succeeded
+        if failed:
+            await self.reconnect()
+        return succeeded, failed
+
+    async def _program_subscribe(
+        self,
+        programkey: SolanaPublicKeyOrStr,
+        accounts: Iterable[SolanaAccount],
+        reconnecting: bool = False,
+        *,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        data_slice: Optional[Tuple[int, int]] = None,
+    ):
         try:
             keystr = str(programkey)
             if keystr in self._programkey_to_subid:
@@ -336,11 +687,14 @@ class WatchSession:
 
             accounts_dict = dict((str(account.key), account) for account in accounts)
             self._pending_program_sub[keystr] = accounts_dict
-            subid = await self._client.ws_program_subscribe(keystr)
+            self._program_sub_options[keystr] = (filters, data_slice)
+            subid = await self._client.ws_program_subscribe(keystr, filters=filters, data_slice=data_slice)
             logger.trace("subscribed to program {} with subid {}", keystr, subid)
             del self._pending_program_sub[keystr]
             self._programkey_to_subid[keystr] = subid
             self._subid_to_program_accounts[subid] = accounts_dict
+            if data_slice is not None:
+                self._partial_subids.add(subid)
         except Exception as e:
             if isinstance(e, asyncio.CancelledError):
                 raise
@@ -348,15 +702,41 @@ class WatchSession:
             if not reconnecting:
                 await self.reconnect()
 
-    def program_subscribe(self, programkey: SolanaPublicKeyOrStr, accounts: Iterable[SolanaAccount]):
-        return self._program_subscribe(programkey, accounts)
+    def program_subscribe(
+        self,
+        programkey: SolanaPublicKeyOrStr,
+        accounts: Iterable[SolanaAccount],
+        *,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        data_slice: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Subscribes to the accounts owned by the given program, updating the
+        given accounts when they change. Only one subscription per program is
+        kept.
+
+        Args:
+            filters: only get updates of accounts matching all of these
+                filters (see solana.memcmp_filter and
+                pythaccounts.account_type_filter)
+            data_slice: only get the first length bytes of account data, as
+                an (offset, length) tuple whose offset must be 0 (the account
+                header is needed to parse the data); price accounts are then
+                updated from partial data, and updates of other accounts are
+                ignored
+        """
+        if data_slice is not None and data_slice[0] != 0:
+            raise ValueError(f"data slice must start at offset 0, not {data_slice[0]}")
+        return self._program_subscribe(programkey, accounts, filters=filters, data_slice=data_slice)
 
     async def program_unsubscribe(self, programkey: SolanaPublicKeyOrStr):
         keystr = str(programkey)
         subid = self._programkey_to_subid.pop(keystr, None)
+        self._program_sub_options.pop(keystr, None)
         if subid is None:
             return
         del self._subid_to_program_accounts[subid]
+        self._partial_subids.discard(subid)
         try:
             logger.trace("unsubscribing from program {} with subid {}...", keystr, subid)
             await self._client.ws_program_unsubscribe(subid)
@@ -374,10 +754,77 @@ class WatchSession:
         accounts_dict = dict((str(account.key), account) for account in accounts)
         self._subid_to_program_accounts[self._programkey_to_subid[keystr]] = accounts_dict
 
+    def _apply_update(self, account: SolanaAccount, msg: codec.AccountNotification, partial: bool = False) -> None:
+        if partial and isinstance(account, PythPriceAccount):
+            account.update_with_rpc_response(msg.slot, msg.value, partial=True)
+        else:
+            account.update_with_rpc_response(msg.slot, msg.value)
+        if self.price_store is not None and isinstance(account, PythPriceAccount):
+            update_price_sink(self.price_store, account)
+
+    def _handle_notification(self, msg: Union[codec.AccountNotification, Dict[str, Any]]) -> Optional[SolanaAccount]:
+        # applies a notification to its account and returns it, or returns
+        # None if the notification is not about a known account
+        if not isinstance(msg, codec.AccountNotification):
+            logger.debug("unknown method {} update from Solana: {}", msg.get("method"), msg)
+            return None
+        if msg.method == codec.ACCOUNT_NOTIFICATION:
+            account = self._subid_to_account[msg.subscription]
+            self._apply_update(account, msg)
+            return account
+        account = self._subid_to_program_accounts[msg.subscription].get(msg.pubkey)
+        if account:
+            partial = msg.subscription in self._partial_subids
+            if partial and not isinstance(account, PythPriceAccount):
+                # only price accounts can be updated from sliced data; the
+                # others would be truncated
+                logger.warning("ignoring sliced programSubscribe update of non-price account {}", msg.pubkey)
+                return None
+            self._apply_update(account, msg, partial=partial)
+            return account
+        logger.warning("got update for account {} from programSubscribe, but this account was never initialised", msg.pubkey)
+        return None
+
+    def _conflate_notifications(self, msgs: List[Union[codec.AccountNotification, Dict[str, Any]]]) -> None:
+        # a newer notification replaces the pending one of the same
+        # subscription and account, keeping its place
+        conflated = self._conflated
+        for msg in msgs:
+            if not isinstance(msg, codec.AccountNotification):
+                self._handle_notification(msg)
+                continue
+            key = (msg.subscription, msg.pubkey)
+            if key in conflated:
+                self.updates_conflated += 1
+            conflated[key] = msg
+
+    def _pop_conflated(self, max_items: int) -> List[codec.AccountNotification]:
+        conflated = self._conflated
+        keys = list(itertools.islice(conflated, max_items))
+        return [conflated.pop(key) for key in keys]
+
+    async def _receive(
+        self, max_items: int, max_wait: Optional[float]
+    ) -> Optional[List[Union[codec.AccountNotification, Dict[str, Any]]]]:
+        # gets notifications from the client, or reconnects and returns None
+        # if the connection failed
+        try:
+            return await self._client.get_next_notifications(max_items, max_wait)
+        except asyncio.CancelledError:
+            raise
+        except exceptions.WebSocketClosedException as e:
+            logger.warning(e.args[0])
+        except Exception as e:
+            logger.exception("exception while retrieving update", exception=e)
+        await self.reconnect()
+        return None
+
     async def next_update(self) -> SolanaAccount:
+        if self.conflate:
+            return (await self.next_updates(1))[0]
         while True:
             try:
-                msg = await self._client.get_next_update()
+                msg = await self._client.get_next_notification()
             except asyncio.CancelledError:
                 raise
             except exceptions.WebSocketClosedException as e:
@@ -389,24 +836,57 @@ class WatchSession:
                 await self.reconnect()
                 continue
 
-            method = msg.get("method")
-            if method == "accountNotification":
-                subid = msg["params"]["subscription"]
-                slot = msg["params"]["result"]["context"]["slot"]
-                account_json = msg["params"]["result"]["value"]
-                account = self._subid_to_account[subid]
-                account.update_with_rpc_response(slot, account_json)
+            account = self._handle_notification(msg)
+            if account:
                 return account
-            elif method == "programNotification":
-                subid = msg["params"]["subscription"]
-                slot = msg["params"]["result"]["context"]["slot"]
-                account_key = msg["params"]["result"]["value"]["pubkey"]
-                account_json = msg["params"]["result"]["value"]["account"]
-                account = self._subid_to_program_accounts[subid].get(account_key)
-                if account:
-                    account.update_with_rpc_response(slot, account_json)
-                    return account
-                else:
-                    logger.warning("got update for account {} from programSubscribe, but this account was never initialised", account_key)
+
+    async def next_updates(self, max_items: int = 1000, max_wait: Optional[float] = None) -> List[SolanaAccount]:
+        """
+        Waits for the next update like next_update, then also applies every
+        update already received after it, up to max_items updates in total.
+
+        Returns the updated accounts in the order the updates arrived (an
+        account updated several times appears several times, unless the session
+        conflates updates), or an empty list if no update arrived within
+        max_wait seconds.
+        """
+        loop = asyncio.get_event_loop()
+        deadline = None if max_wait is None else loop.time() + max_wait
+        while True:
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            if not self.conflate:
+                msgs = await self._receive(max_items, timeout)
+                if msgs is None:
+                    continue
             else:
-                logger.debug("unknown method {} update from Solana: {}", method, msg)
+                if self._conflated:
+                    # return the pending updates now, superseded by any
+                    # received since
+                    timeout = 0
+                received = await self._receive(sys.maxsize, timeout)
+                if received is None:
+                    continue
+                self._conflate_notifications(received)
+                msgs = self._pop_conflated(max_items)
+
+            if not msgs:
+                return []
+            accounts = []
+            for msg in msgs:
+                # one bad notification must not lose the rest of the batch
+                try:
+                    account = self._handle_notification(msg)
+                except Exception as e:
+                    logger.exception("exception while handling update", exception=e)
+                    continue
+                if account:
+                    accounts.append(account)
+            if accounts:
+                return accounts
+
+    async def __aiter__(self) -> AsyncIterator[SolanaAccount]:
+        """
+        Iterates over updated accounts as the updates arrive, forever.
+        """
+        while True:
+            yield await self.next_update()
@@ -0,0 +1,129 @@
+"""
+Background revalidation of the accounts loaded by a PythClient.
+
+After a warm start (for example from a snapshot) the loaded accounts may be
+stale. A PythRevalidation refreshes them in the background, prioritised
+accounts first, and reconciles accounts added to or removed from the
+mapping and price chains, while the client keeps serving the cached data.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, List, Optional, Sequence, Set
+import asyncio
+
+from .pricestore import update_price_sink
+from .pythaccounts import PythAccount, PythPriceAccount, PythProductAccount, check_price_changes
+from .solana import SolanaPublicKeyOrStr
+
+if TYPE_CHECKING:
+    from .pythclient import PythClient
+
+
+class PythRevalidationEventType(Enum):
+    UPDATED = "updated"
+    ADDED = "added"
+    REMOVED = "removed"
+
+
+@dataclass(frozen=True)
+class PythRevalidationEvent:
+    """
+    Reports an account whose data changed, or which was added or removed,
+    during a revalidation.
+    """
+
+    type: PythRevalidationEventType
+    account: PythAccount
+
+
+class PythRevalidation:
+    """
+    A running background revalidation, see PythClient.revalidate.
+
+    Attributes:
+        events (asyncio.Queue): PythRevalidationEvents as they happen,
+            followed by None once the revalidation is over
+        ready (asyncio.Task): completes once every account is current (or
+            with the exception that stopped the revalidation)
+    """
+
+    def __init__(self, client: PythClient, priority: Iterable[SolanaPublicKeyOrStr] = ()) -> None:
+        self._client = client
+        self._priority: Set[str] = set(str(key) for key in priority)
+        self.events: asyncio.Queue[Optional[PythRevalidationEvent]] = asyncio.Queue()
+        self.ready: asyncio.Task[None] = asyncio.ensure_future(self._run())
+        self.ready.add_done_callback(lambda _: self.events.put_nowait(None))
+
+    def cancel(self) -> None:
+        self.ready.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[PythRevalidationEvent]:
+        while True:
+            event = await self.events.get()
+            if event is None:
+                return
+            yield event
+
+    def _emit(self, type_: PythRevalidationEventType, accounts: Iterable[PythAccount]) -> None:
+        for account in accounts:
+            self.events.put_nowait(PythRevalidationEvent(type_, account))
+
+    async def _update(self, accounts: Sequence[PythAccount]) -> None:
+        # refresh the accounts together and report those whose data changed
+        applied = [account.updates_applied for account in accounts]
+        await self._client.solana.update_accounts(accounts)
+        price_store = self._client.price_store
+        for account, before in zip(accounts, applied):
+            if account.updates_applied == before:
+                continue
+            if price_store is not None and isinstance(account, PythPriceAccount):
+                update_price_sink(price_store, account)
+            self._emit(PythRevalidationEventType.UPDATED, [account])
+
+    async def _run(self) -> None:
+        client = self._client
+        if client._products is None or client._mapping_accounts is None:
+            # nothing cached to serve from: just load everything
+            await client.refresh_all_prices()
+            self._emit(PythRevalidationEventType.ADDED, await client.get_all_accounts())
+            return
+
+        prices = [price for product in client._products for price in _loaded_prices(product)]
+        await self._update([price for price in prices if str(price.key) in self._priority])
+
+        added, removed = await client.check_mapping_changes()
+        self._emit(PythRevalidationEventType.ADDED, added)
+        self._emit(PythRevalidationEventType.REMOVED, removed)
+        for account in removed:
+            if isinstance(account, PythProductAccount):
+                self._emit(PythRevalidationEventType.REMOVED, _loaded_prices(account))
+
+        added_keys = set(account.key for account in added)
+        await self._update([
+            *(product for product in client._products if product.key not in added_keys),
+            *(price for price in prices if str(price.key) not in self._priority),
+        ])
+
+        # load the price chains of new products together
+        new_products = [product for product in client._products if product._prices is None]
+        await client.load_prices(new_products)
+        for product in new_products:
+            self._emit(PythRevalidationEventType.ADDED, _loaded_prices(product))
+
+        # fetch the prices added to the other products' chains together
+        new_product_keys = set(product.key for product in new_products)
+        added_prices, removed_prices = await check_price_changes(
+            [product for product in client._products if product.key not in new_product_keys],
+            update_accounts=False,
+        )
+        self._emit(PythRevalidationEventType.ADDED, added_prices)
+        self._emit(PythRevalidationEventType.REMOVED, removed_prices)
+        if client.price_store is not None:
+            for price in added_prices:
+                update_price_sink(client.price_store, price)
+
+
+def _loaded_prices(product: PythProductAccount) -> List[PythPriceAccount]:
+    return list(product._prices.values()) if product._prices else []
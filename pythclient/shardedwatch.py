@@ -0,0 +1,189 @@
+"""
+Watch sessions spread across several WebSocket connections.
+
+A single WebSocket carrying thousands of subscriptions is a throughput
+bottleneck, and a reconnect drops every subscription at once. A
+ShardedWatchSession assigns each account to one of several WatchSessions,
+each with its own connection (possibly to different RPC endpoints), and
+merges their updates into one stream. Each shard reconnects on its own.
+
+Accounts are assigned to shards by consistent hashing of their keys, so
+adding a shard only moves about 1/N of the accounts.
+"""
+
+from __future__ import annotations
+from bisect import bisect
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+
+from .pricestore import PythPriceSink
+from .pythclient import DEFAULT_MAX_IN_FLIGHT_SUBSCRIPTIONS, WatchSession
+from .solana import SolanaAccount, SolanaClient, SolanaPublicKeyOrStr
+
+# points each shard gets on the hash ring; more points spread accounts more evenly
+DEFAULT_RING_REPLICAS = 100
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class ShardedWatchSession:
+    """
+    Spreads subscriptions across several WatchSessions, one per SolanaClient,
+    and merges their updates.
+
+    Attributes:
+        shards (List[WatchSession]): the watch session of each client
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[SolanaClient],
+        *,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_SUBSCRIPTIONS,
+        price_store: Optional[PythPriceSink] = None,
+        conflate: bool = False,
+        ring_replicas: int = DEFAULT_RING_REPLICAS,
+    ) -> None:
+        """
+        Args:
+            clients (Sequence[SolanaClient]): one client per shard, each with
+                its own WebSocket connection
+            max_in_flight, price_store, conflate: passed to each shard's
+                WatchSession
+            ring_replicas (int): the number of points each shard gets on the
+                consistent hash ring
+        """
+        if not clients:
+            raise ValueError("at least one client is required")
+        self.shards: List[WatchSession] = [
+            WatchSession(client, max_in_flight=max_in_flight, price_store=price_store, conflate=conflate)
+            for client in clients
+        ]
+        ring = sorted(
+            (_hash(f"{index}-{replica}".encode()), index)
+            for index in range(len(clients))
+            for replica in range(ring_replicas)
+        )
+        self._ring_hashes = [point for point, _ in ring]
+        self._ring_shards = [index for _, index in ring]
+        # the pending next_updates call of each shard, kept across calls so no
+        # update is lost when another shard answers first
+        self._pending: Dict[int, asyncio.Task[List[SolanaAccount]]] = {}
+        self._buffer: Deque[SolanaAccount] = deque()
+        self._max_items = 1000
+
+    def shard_index(self, key: SolanaPublicKeyOrStr) -> int:
+        """Gets the index of the shard the given account key is assigned to."""
+        point = bisect(self._ring_hashes, _hash(str(key).encode()))
+        return self._ring_shards[point % len(self._ring_shards)]
+
+    def shard_for(self, key: SolanaPublicKeyOrStr) -> WatchSession:
+        """Gets the shard the given account key is assigned to."""
+        return self.shards[self.shard_index(key)]
+
+    def _group(self, accounts: Iterable[SolanaAccount]) -> Dict[int, List[SolanaAccount]]:
+        groups: Dict[int, List[SolanaAccount]] = {}
+        for account in accounts:
+            groups.setdefault(self.shard_index(account.key), []).append(account)
+        return groups
+
+    @property
+    def subscribed_keys(self) -> List[str]:
+        """The keys of the accounts subscribed to with subscribe."""
+        return [key for shard in self.shards for key in shard.subscribed_keys]
+
+    async def connect(self) -> None:
+        await asyncio.gather(*(shard.connect() for shard in self.shards))
+
+    async def disconnect(self) -> None:
+        pending, self._pending = self._pending, {}
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending.values())
+        await asyncio.gather(*(shard.disconnect() for shard in self.shards))
+
+    async def close(self) -> None:
+        """
+        Disconnects every shard and closes their clients.
+        """
+        await self.disconnect()
+        await asyncio.gather(*(shard._client.close() for shard in self.shards))
+
+    async def subscribe(self, account: SolanaAccount) -> None:
+        await self.shard_for(account.key).subscribe(account)
+
+    async def unsubscribe(self, account: SolanaAccount) -> None:
+        await self.shard_for(account.key).unsubscribe(account)
+
+    async def subscribe_many(self, accounts: Iterable[SolanaAccount], max_in_flight: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Subscribes to many accounts, each shard subscribing to its accounts
+        concurrently (see WatchSession.subscribe_many).
+        """
+        results = await asyncio.gather(*(
+            self.shards[index].subscribe_many(group, max_in_flight) for index, group in self._group(accounts).items()
+        ))
+        return sum(succeeded for succeeded, _ in results), sum(failed for _, failed in results)
+
+    async def unsubscribe_many(self, accounts: Iterable[SolanaAccount], max_in_flight: Optional[int] = None) -> Tuple[int, int]:
+        results = await asyncio.gather(*(
+            self.shards[index].unsubscribe_many(group, max_in_flight) for index, group in self._group(accounts).items()
+        ))
+        return sum(succeeded for succeeded, _ in results), sum(failed for _, failed in results)
+
+    async def program_subscribe(self, programkey: SolanaPublicKeyOrStr, accounts: Iterable[SolanaAccount], **kwargs: Any) -> None:
+        """
+        Subscribes to a program on the shard its key is assigned to (see
+        WatchSession.program_subscribe).
+        """
+        await self.shard_for(programkey).program_subscribe(programkey, accounts, **kwargs)
+
+    async def program_unsubscribe(self, programkey: SolanaPublicKeyOrStr) -> None:
+        await self.shard_for(programkey).program_unsubscribe(programkey)
+
+    def update_program_accounts(self, programkey: SolanaPublicKeyOrStr, accounts: Iterable[SolanaAccount]) -> None:
+        self.shard_for(programkey).update_program_accounts(programkey, accounts)
+
+    async def next_updates(self, max_items: int = 1000, max_wait: Optional[float] = None) -> List[SolanaAccount]:
+        """
+        Waits for updates from any shard, like WatchSession.next_updates, and
+        returns those of every shard that has some, up to max_items.
+        """
+        if not self._buffer:
+            self._max_items = max_items
+            for index, shard in enumerate(self.shards):
+                if index not in self._pending:
+                    self._pending[index] = asyncio.ensure_future(shard.next_updates(max_items))
+            done, _ = await asyncio.wait(self._pending.values(), timeout=max_wait, return_when=asyncio.FIRST_COMPLETED)
+            error: Optional[BaseException] = None
+            for index, task in list(self._pending.items()):
+                if task not in done:
+                    continue
+                del self._pending[index]
+                # keep the updates of the other shards if one of them failed;
+                # they are returned by the next call
+                try:
+                    self._buffer.extend(task.result())
+                except BaseException as e:
+                    error = error or e
+            if error is not None:
+                raise error
+        buffer = self._buffer
+        return [buffer.popleft() for _ in range(min(max_items, len(buffer)))]
+
+    async def next_update(self) -> SolanaAccount:
+        while not self._buffer:
+            await self.next_updates(self._max_items)
+        return self._buffer.popleft()
+
+    async def __aiter__(self) -> AsyncIterator[SolanaAccount]:
+        """
+        Iterates over updated accounts from every shard, forever.
+        """
+        while True:
+            yield await self.next_update()
@@ -0,0 +1,254 @@
+"""
+Shared-memory table of aggregate prices for multi-process consumers.
+
+One publisher process owns the WatchSession (or polling loop) and writes
+every price update into a SharedPriceTable; any number of reader processes
+attach to the same table by name and read prices without locks or RPC calls.
+
+Each row is guarded by a sequence number (a seqlock): the writer makes it odd
+before changing the row and even again afterwards, and readers retry until
+they see the same even sequence number before and after reading.
+"""
+
+from __future__ import annotations
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import struct
+import sys
+import time
+
+from .pythaccounts import PythPriceAccount, PythPriceStatus
+from .solana import SolanaPublicKey
+
+_MAGIC = b"PYSP"
+_VERSION = 1
+
+# magic, version, capacity, number of rows in use
+_HEADER = struct.Struct("<4sIII")
+# price account key, product symbol (utf-8, zero padded)
+_INDEX_ENTRY = struct.Struct("<32s32s")
+# sequence number, raw price, raw confidence interval, status, exponent,
+# publish slot, slot, timestamp
+_ROW = struct.Struct("<QqQIiQQq")
+_SEQUENCE = struct.Struct("<Q")
+
+# busy-wait this many times on a row being written before yielding the CPU
+_SPINS_BEFORE_SLEEP = 100
+# how long read waits for a row being written, by default
+DEFAULT_READ_TIMEOUT = 1.0
+
+
+class SharedPrice(NamedTuple):
+    """
+    A consistent copy of one row of a SharedPriceTable.
+    """
+
+    raw_price: int
+    raw_confidence_interval: int
+    price_status: PythPriceStatus
+    exponent: int
+    pub_slot: int
+    slot: int
+    timestamp: int
+
+    @property
+    def price(self) -> float:
+        return self.raw_price * (10 ** self.exponent)
+
+    @property
+    def confidence_interval(self) -> float:
+        return self.raw_confidence_interval * (10 ** self.exponent)
+
+
+class SharedPriceTable:
+    """
+    A fixed-capacity table of aggregate prices in shared memory.
+
+    Use create() in the publisher process and pass the table as price_store
+    to PythClient or WatchSession (or call update() directly); use attach()
+    in reader processes. Only one process may write to a table.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf
+        assert buf is not None
+        magic, version, capacity, _ = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"shared memory {shm.name} does not contain a price table")
+        if version != _VERSION:
+            raise ValueError(f"shared memory {shm.name} has unsupported price table version {version}")
+        self.capacity: int = capacity
+        self._rows_offset = _HEADER.size + capacity * _INDEX_ENTRY.size
+        self._keys: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._symbol_index: Dict[str, int] = {}
+
+    @property
+    def name(self) -> str:
+        """The name other processes attach() to."""
+        return self._shm.name
+
+    @staticmethod
+    def create(capacity: int, name: Optional[str] = None) -> SharedPriceTable:
+        """
+        Creates a new table with room for capacity price accounts.
+        """
+        size = _HEADER.size + capacity * (_INDEX_ENTRY.size + _ROW.size)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, capacity, 0)
+        return SharedPriceTable(shm, owner=True)
+
+    @staticmethod
+    def attach(name: str) -> SharedPriceTable:
+        """
+        Attaches to a table created by another process.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # otherwise the resource tracker of this process unlinks the
+            # table when this process exits
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+        return SharedPriceTable(shm, owner=False)
+
+    def close(self) -> None:
+        """
+        Closes this process's view of the table; the creator also destroys it.
+        """
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> SharedPriceTable:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _row_offset(self, index: int) -> int:
+        return self._rows_offset + index * _ROW.size
+
+    def _refresh_index(self) -> None:
+        buf = self._shm.buf
+        count = _HEADER.unpack_from(buf, 0)[3]
+        for index in range(len(self._keys), count):
+            key_bytes, symbol_bytes = _INDEX_ENTRY.unpack_from(buf, _HEADER.size + index * _INDEX_ENTRY.size)
+            key = str(SolanaPublicKey.from_bytes(key_bytes))
+            self._keys.append(key)
+            self._index[key] = index
+            symbol = symbol_bytes.rstrip(b"\0").decode("utf-8", "replace")
+            if symbol:
+                self._symbol_index[symbol] = index
+
+    def _lookup(self, key: str) -> Optional[int]:
+        index = self._index.get(key)
+        if index is None:
+            index = self._symbol_index.get(key)
+        return index
+
+    def index_of(self, key_or_symbol: object) -> int:
+        """
+        Gets the row index of a price account, by account key or product
+        symbol.
+
+        Raises KeyError if the table has no such row.
+        """
+        key = str(key_or_symbol)
+        index = self._lookup(key)
+        if index is None:
+            self._refresh_index()
+            index = self._lookup(key)
+            if index is None:
+                raise KeyError(key)
+        return index
+
+    def __len__(self) -> int:
+        return _HEADER.unpack_from(self._shm.buf, 0)[3]
+
+    def __contains__(self, key_or_symbol: object) -> bool:
+        try:
+            self.index_of(key_or_symbol)
+        except KeyError:
+            return False
+        return True
+
+    def keys(self) -> Iterator[str]:
+        """Iterates over the price account keys of all rows."""
+        self._refresh_index()
+        return iter(list(self._keys))
+
+    def update(self, account: PythPriceAccount) -> Optional[int]:
+        """
+        Writes the aggregate price of the given price account into its row,
+        adding a row if needed. Returns the row index, or None if the account
+        has no price data yet.
+
+        Raises ValueError if the table is full.
+        """
+        info = account.aggregate_price_info
+        if info is None:
+            return None
+        buf = self._shm.buf
+        key = str(account.key)
+        index = self._index.get(key)
+        if index is None:
+            index = len(self._keys)
+            if index >= self.capacity:
+                raise ValueError(f"shared price table {self.name} is full ({self.capacity} rows)")
+            symbol = account.product.symbol if account.product else ""
+            # the index only has room for 32 bytes: truncate on a character
+            # boundary
+            symbol = symbol.encode("utf-8")[:32].decode("utf-8", "ignore")
+            _INDEX_ENTRY.pack_into(buf, _HEADER.size + index * _INDEX_ENTRY.size,
+                                   bytes(account.key), symbol.encode("utf-8"))
+            self._keys.append(key)
+            self._index[key] = index
+            if symbol:
+                self._symbol_index[symbol] = index
+            new_row = True
+        else:
+            new_row = False
+
+        offset = self._row_offset(index)
+        sequence = _SEQUENCE.unpack_from(buf, offset)[0]
+        _SEQUENCE.pack_into(buf, offset, sequence + 1)
+        _ROW.pack_into(buf, offset, sequence + 1,
+                       info.raw_price, info.raw_confidence_interval, info.price_status.value, info.exponent,
+                       info.pub_slot, account.slot or 0, account.timestamp)
+        _SEQUENCE.pack_into(buf, offset, sequence + 2)
+        if new_row:
+            # make the row visible to readers only once it is written
+            _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, self.capacity, index + 1)
+        return index
+
+    def read(self, key_or_symbol: object, timeout: float = DEFAULT_READ_TIMEOUT) -> SharedPrice:
+        """
+        Reads the row of a price account, by account key or product symbol,
+        retrying while the publisher is writing it.
+
+        Raises KeyError if the table has no such row, and TimeoutError if the
+        row is still being written after timeout seconds (the publisher died
+        while writing it).
+        """
+        buf = self._shm.buf
+        offset = self._row_offset(self.index_of(key_or_symbol))
+        spins = 0
+        deadline = None
+        while True:
+            (sequence, raw_price, raw_conf, status, exponent,
+             pub_slot, slot, timestamp) = _ROW.unpack_from(buf, offset)
+            if sequence % 2 == 0 and _SEQUENCE.unpack_from(buf, offset)[0] == sequence:
+                return SharedPrice(raw_price, raw_conf, PythPriceStatus(status), exponent, pub_slot, slot, timestamp)
+            spins += 1
+            if spins >= _SPINS_BEFORE_SLEEP:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + timeout
+                elif now > deadline:
+                    raise TimeoutError(f"row of {key_or_symbol} in shared price table {self.name} is still being written")
+                time.sleep(0)
+                spins = 0
@@ -0,0 +1,128 @@
+"""
+On-disk snapshots of Pyth accounts.
+
+A snapshot file holds the raw data of many accounts, the slot each was
+fetched at and an index of their keys. The file is memory-mapped when opened,
+so only the index is read up front and each account's data is read when it is
+looked up.
+
+File layout (little endian):
+    header: magic (char[4]), version (u32), number of accounts (u32)
+    index: per account, key (char[32]), slot (u64), data offset (u64),
+        data length (u32)
+    data: the raw account data, including the Pyth account header
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import mmap
+import os
+import struct
+
+from .pythaccounts import PythAccount
+from .solana import SolanaPublicKey, SolanaPublicKeyOrStr
+
+_MAGIC = b"PYSS"
+_VERSION = 1
+
+_HEADER = struct.Struct("<4sII")
+_INDEX_ENTRY = struct.Struct("<32sQQI")
+
+
+def _key_bytes(key: SolanaPublicKeyOrStr) -> bytes:
+    if isinstance(key, str):
+        key = SolanaPublicKey(key)
+    return bytes(key)
+
+
+def write_snapshot(path: str, accounts: Iterable[PythAccount]) -> int:
+    """
+    Writes the raw data of the given accounts to a snapshot file, replacing
+    it atomically. Accounts without raw data (never updated) are skipped.
+
+    Returns the number of accounts written.
+    """
+    entries = [(bytes(account.key), account.slot or 0, account.data) for account in accounts if account.data is not None]
+    offset = _HEADER.size + len(entries) * _INDEX_ENTRY.size
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(entries)))
+        for key, slot, data in entries:
+            f.write(_INDEX_ENTRY.pack(key, slot, offset, len(data)))
+            offset += len(data)
+        for _, _, data in entries:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+class PythSnapshot:
+    """
+    A snapshot file opened for reading.
+
+    Attributes:
+        slot (int): the highest slot of any account in the snapshot
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a Pyth snapshot")
+            if version != _VERSION:
+                raise ValueError(f"{path} has unsupported snapshot version {version}")
+            self._index: Dict[bytes, Tuple[int, int, int]] = {}
+            for i in range(count):
+                key, slot, offset, length = _INDEX_ENTRY.unpack_from(self._mmap, _HEADER.size + i * _INDEX_ENTRY.size)
+                if offset + length > len(self._mmap):
+                    raise ValueError(f"{path} is truncated")
+                self._index[key] = (slot, offset, length)
+        except Exception:
+            self._mmap.close()
+            raise
+        self.slot: int = max((slot for slot, _, _ in self._index.values()), default=0)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> PythSnapshot:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: SolanaPublicKeyOrStr) -> bool:
+        return _key_bytes(key) in self._index
+
+    def keys(self) -> Iterator[SolanaPublicKey]:
+        return (SolanaPublicKey.from_bytes(key) for key in self._index)
+
+    def get(self, key: SolanaPublicKeyOrStr) -> Optional[Tuple[int, bytes]]:
+        """
+        Gets the slot and raw data of the account with the given key, or None
+        if it is not in the snapshot.
+        """
+        entry = self._index.get(_key_bytes(key))
+        if entry is None:
+            return None
+        slot, offset, length = entry
+        return slot, self._mmap[offset:offset + length]
+
+    def load(self, account: PythAccount) -> bool:
+        """
+        Updates the given account from the snapshot. Returns False if the
+        account is not in the snapshot.
+        """
+        entry = self.get(account.key)
+        if entry is None:
+            return False
+        slot, data = entry
+        account.update_with_data(slot, data)
+        return True
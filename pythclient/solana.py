@@ -1,8 +1,9 @@
 from __future__ import annotations
-from typing import Union, Optional, Dict, List, Any, Sequence, cast
+from collections import deque
+from typing import Union, Optional, Deque, Dict, List, Any, Sequence, Tuple, cast
 from typing_extensions import Literal
 import asyncio
-import json
+import functools
 
 import aiohttp
 import backoff
@@ -11,7 +12,7 @@ from loguru import logger
 
 from .exceptions import RateLimitedException, SolanaException, WebSocketClosedException
 from .ratelimit import RateLimit
-from . import config
+from . import codec, config
 
 WS_PREFIX = "wss"
 HTTP_PREFIX = "https"
@@ -41,11 +42,34 @@ PYTHTEST_CROSSCHAIN_HTTP_ENDPOINT = HTTP_PREFIX + "://" + PYTHTEST_CROSSCHAIN_EN
 PYTHTEST_CONFORMANCE_WS_ENDPOINT = WS_PREFIX + "://" + PYTHTEST_CONFORMANCE_ENDPOINT
 PYTHTEST_CONFORMANCE_HTTP_ENDPOINT = HTTP_PREFIX + "://" + PYTHTEST_CONFORMANCE_ENDPOINT
 
+# maximum number of distinct keys kept by SolanaPublicKey.from_bytes and the
+# base58 encoding cache
+PUBLIC_KEY_CACHE_SIZE = 65536
+
+# the maximum number of accounts getMultipleAccounts returns per call
+MAX_MULTIPLE_ACCOUNTS = 100
+
+
+@functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _b58encode(key: bytes) -> str:
+    return base58.b58encode(key).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _b58decode(key: str) -> bytes:
+    return base58.b58decode(key)
+
+
 class SolanaPublicKey:
     """
     Represents a Solana public key. This class is meant to be immutable.
+
+    The raw key bytes are stored; the base58 representation is only computed
+    when it is first needed.
     """
 
+    __slots__ = ("key_bytes", "_key")
+
     LENGTH = 32
     NULL_KEY: SolanaPublicKey
 
@@ -54,35 +78,59 @@ class SolanaPublicKey:
         Constructs a new SolanaPublicKey, either from a base58-encoded str or a raw 32-byte bytes.
         """
         if isinstance(key, str):
-            b58len = len(base58.b58decode(key))
-            if b58len != SolanaPublicKey.LENGTH:
+            key_bytes = _b58decode(key)
+            if len(key_bytes) != SolanaPublicKey.LENGTH:
                 raise ValueError(
-                    f"invalid byte length of key, expected {SolanaPublicKey.LENGTH}, got {b58len}"
+                    f"invalid byte length of key, expected {SolanaPublicKey.LENGTH}, got {len(key_bytes)}"
                 )
-            self.key = key
+            self.key_bytes: bytes = key_bytes
+            self._key: Optional[str] = key
         elif isinstance(key, bytes): # type: ignore  # suppress unnecessaryIsInstance here
             if len(key) != SolanaPublicKey.LENGTH:
                 raise ValueError(
                     f"invalid byte length of key, expected {SolanaPublicKey.LENGTH}, got {len(key)}"
                 )
-            self.key = base58.b58encode(key).decode("utf-8")
+            self.key_bytes = key
+            self._key = None
         else:
             raise ValueError(f"expected str or bytes for key, got {type(key)}")
 
+    @staticmethod
+    @functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+    def from_bytes(key: bytes) -> SolanaPublicKey:
+        """
+        Gets the SolanaPublicKey for a raw 32-byte key. Recently seen keys are
+        interned, so parsing the same key again neither allocates nor encodes.
+        """
+        return SolanaPublicKey(key)
+
+    @property
+    def key(self) -> str:
+        """
+        The base58 representation of this key.
+        """
+        key = self._key
+        if key is None:
+            key = self._key = _b58encode(self.key_bytes)
+        return key
+
     def __str__(self):
         return self.key
 
     def __repr__(self):
         return str(self)
 
-    # __hash__ and __eq__ simply pass through to self.key (str). this is present
+    def __bytes__(self):
+        return self.key_bytes
+
+    # __hash__ and __eq__ pass through to self.key_bytes (bytes). this is present
     # so that SolanaPublicKey can be used as a dictionary key and so that equality
     # works as expected (i.e. SolanaPublicKey("abc") == SolanaPublicKey("abc"))
     def __hash__(self):
-        return self.key.__hash__()
+        return self.key_bytes.__hash__()
 
     def __eq__(self, other: Any):
-        return isinstance(other, SolanaPublicKey) and self.key.__eq__(other.key)
+        return isinstance(other, SolanaPublicKey) and self.key_bytes.__eq__(other.key_bytes)
 
 
 SolanaPublicKeyOrStr = Union[SolanaPublicKey, str]
@@ -140,6 +188,139 @@ class SolanaCommitment:
     PROCESSED = "processed"
 
 
+class SolanaUpdateQueuePolicy:
+    """
+    What a SolanaUpdateQueue does with a notification when it is full.
+    """
+
+    # stop reading the WebSocket until the consumer catches up, unless
+    # requests are waiting for their responses: the queue then grows past its
+    # size so the responses can be read
+    BLOCK = "block"
+    # discard the oldest queued notification
+    DROP_OLDEST = "drop_oldest"
+    # keep only the latest notification per subscription and account, and
+    # discard the oldest queued notification if still full
+    COALESCE = "coalesce"
+
+
+class SolanaUpdateQueue:
+    """
+    Buffers the notifications read from a WebSocket connection by the reader
+    task of a SolanaClient until they are consumed.
+
+    Attributes:
+        maxsize (int): the most notifications queued at once, 0 for no limit
+        policy (str): a SolanaUpdateQueuePolicy
+        dropped (int): the notifications discarded because the queue was full
+        coalesced (int): the notifications replaced by a newer one about the
+            same account before being consumed
+        high_water (int): the most notifications that were queued at once
+    """
+
+    def __init__(self, maxsize: int = 0, policy: str = SolanaUpdateQueuePolicy.BLOCK) -> None:
+        if policy not in (SolanaUpdateQueuePolicy.BLOCK, SolanaUpdateQueuePolicy.DROP_OLDEST, SolanaUpdateQueuePolicy.COALESCE):
+            raise ValueError(f"unknown update queue policy {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        # [coalescing key, notification] pairs, oldest first; replacing the
+        # notification of a queued pair keeps its place in the queue
+        self._items: Deque[List[Any]] = deque()
+        self._latest: Dict[Tuple[int, Optional[str]], List[Any]] = {}
+        self._exception: Optional[BaseException] = None
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    @property
+    def closed(self) -> bool:
+        return self._exception is not None
+
+    def close(self, exception: BaseException) -> None:
+        """
+        Ends the queue: once the queued notifications are consumed, get
+        raises the given exception.
+        """
+        if self._exception is None:
+            self._exception = exception
+        self._not_empty.set()
+
+    def full(self) -> bool:
+        return bool(self.maxsize) and len(self._items) >= self.maxsize
+
+    async def wait_for_room(self) -> None:
+        """
+        Waits until a notification is consumed, or until wake is called.
+        """
+        self._not_full.clear()
+        await self._not_full.wait()
+
+    def wake(self) -> None:
+        """
+        Wakes up wait_for_room without consuming a notification.
+        """
+        self._not_full.set()
+
+    def put_nowait(self, notification: Union[codec.AccountNotification, Dict[str, Any]]) -> None:
+        """
+        Queues a notification without waiting: with the BLOCK policy, the
+        queue grows past its size when full.
+        """
+        key = None
+        if self.policy == SolanaUpdateQueuePolicy.COALESCE and isinstance(notification, codec.AccountNotification):
+            key = (notification.subscription, notification.pubkey)
+            pending = self._latest.get(key)
+            if pending is not None:
+                pending[1] = notification
+                self.coalesced += 1
+                return
+        if self.full() and self.policy != SolanaUpdateQueuePolicy.BLOCK:
+            self._popleft()
+            self.dropped += 1
+        item = [key, notification]
+        self._items.append(item)
+        if key is not None:
+            self._latest[key] = item
+        self.high_water = max(self.high_water, len(self._items))
+        self._not_empty.set()
+
+    def _popleft(self) -> Union[codec.AccountNotification, Dict[str, Any]]:
+        key, notification = self._items.popleft()
+        if key is not None:
+            del self._latest[key]
+        self._not_full.set()
+        return notification
+
+    def get_nowait(self) -> Union[codec.AccountNotification, Dict[str, Any]]:
+        """
+        Gets the oldest notification; raises asyncio.QueueEmpty if there is
+        none, or the exception the queue was closed with.
+        """
+        if self._items:
+            return self._popleft()
+        if self._exception is not None:
+            raise self._exception
+        raise asyncio.QueueEmpty()
+
+    async def get(self) -> Union[codec.AccountNotification, Dict[str, Any]]:
+        """
+        Waits for the oldest notification; raises the exception the queue was
+        closed with once it is empty.
+        """
+        while not self._items and self._exception is None:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+
 class SolanaClient:
     def __init__(
         self,
@@ -147,7 +328,11 @@ class SolanaClient:
         client: Optional[aiohttp.ClientSession] = None,
         *,
         endpoint: str = SOLANA_DEVNET_HTTP_ENDPOINT,
-        ws_endpoint: str = SOLANA_DEVNET_WS_ENDPOINT
+        ws_endpoint: str = SOLANA_DEVNET_WS_ENDPOINT,
+        max_concurrent_requests: int = 1,
+        max_batch_requests: int = 1,
+        update_queue_size: int = 0,
+        update_queue_policy: str = SolanaUpdateQueuePolicy.BLOCK
     ):
         """
         Initialises a new Solana API client.
@@ -162,6 +347,18 @@ class SolanaClient:
                 devnet endpoint
             ws_endpoint (str): the URL to the WebSocket endpoint; defaults to
                 the Solana devnet endpoint
+            max_concurrent_requests (int): the default number of requests
+                update_accounts keeps in flight at once; requests are still
+                subject to the rate limit
+            max_batch_requests (int): the number of getMultipleAccounts
+                requests update_accounts sends in one JSON-RPC batch; 1
+                disables batching (not all RPC providers accept batches)
+            update_queue_size (int): the most WebSocket notifications buffered
+                until they are consumed, 0 for no limit
+            update_queue_policy (str): the SolanaUpdateQueuePolicy applied when
+                update_queue_size notifications are buffered; with BLOCK the
+                WebSocket is not read until notifications are consumed, except
+                while requests are waiting for their responses
         """
 
         # can't create one now as the ClientSession has to be created while in an
@@ -170,6 +367,8 @@ class SolanaClient:
         self._is_own_client = False
         self.endpoint = endpoint
         self.ws_endpoint = ws_endpoint
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_batch_requests = max_batch_requests
         self.ratelimit: Union[RateLimit, Literal[False]] = (
             RateLimit.get_endpoint_ratelimit(endpoint)
             if ratelimit is None
@@ -177,7 +376,23 @@ class SolanaClient:
         )
         self._next_id = 0
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
-        self._pending_updates: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+        self._ws_connect_lock: Optional[asyncio.Lock] = None
+        self._ws_reader: Optional[asyncio.Task[None]] = None
+        self._ws_responses: Dict[int, asyncio.Future[Any]] = {}
+        self.update_queue_size = update_queue_size
+        self.update_queue_policy = update_queue_policy
+        self._pending_updates = self._make_update_queue()
+
+    def _make_update_queue(self) -> SolanaUpdateQueue:
+        return SolanaUpdateQueue(self.update_queue_size, self.update_queue_policy)
+
+    @property
+    def update_queue(self) -> SolanaUpdateQueue:
+        """
+        The notification queue of the current WebSocket connection, whose
+        counters cover that connection only.
+        """
+        return self._pending_updates
 
     def _get_next_id(self):
         id = self._next_id
@@ -205,22 +420,70 @@ class SolanaClient:
     async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any):
         await self.close()
 
-    async def update_accounts(self, accounts: Sequence[SolanaAccount]) -> None:
+    async def update_accounts(
+        self,
+        accounts: Sequence[SolanaAccount],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Updates the given accounts using getMultipleAccounts.
+
+        Up to max_batch_requests getMultipleAccounts calls are combined into
+        one JSON-RPC batch, and up to max_concurrency HTTP requests (defaults
+        to max_concurrent_requests) are in flight at once. Each account is
+        updated with the slot of the response it came in.
+
+        Returns the minimum and maximum slot seen across all responses, or
+        (None, None) if there were no accounts.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrent_requests
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def update_groups(groups: Sequence[Sequence[SolanaAccount]]) -> List[int]:
+            async with semaphore:
+                if len(groups) == 1:
+                    resps = [await self.get_account_info([account.key for account in groups[0]])]
+                else:
+                    batch = self.batch()
+                    futures = [batch.get_account_info([account.key for account in group]) for group in groups]
+                    await batch.send()
+                    resps = [future.result() for future in futures]
+            slots: List[int] = []
+            for grouped_accounts, resp in zip(groups, resps):
+                slot = resp["context"]["slot"]
+                values = resp["value"]
+                for account, value in zip(grouped_accounts, values):
+                    if value is None:
+                        logger.warning("got null value from Solana getMultipleAccounts for {}; non-existent account?", account.key)
+                        continue
+                    try:
+                        account.update_with_rpc_response(slot, value)
+                    except Exception as ex:
+                        logger.exception("error while updating account {}", account.key, exception=ex)
+                slots.append(slot)
+            return slots
+
         # Solana's getMultipleAccounts RPC is limited to 100 accounts
         # Hence we have to split them into groups of 100
         # https://docs.solana.com/developing/clients/jsonrpc-api#getmultipleaccounts
-        for grouped_accounts in [accounts[i:i+100] for i in range(0, len(accounts), 100)]:
-            resp = await self.get_account_info([account.key for account in grouped_accounts])
-            slot = resp["context"]["slot"]
-            values = resp["value"]
-            for account, value in zip(grouped_accounts, values):
-                if value is None:
-                    logger.warning("got null value from Solana getMultipleAccounts for {}; non-existent account?", account.key)
-                    continue
-                try:
-                    account.update_with_rpc_response(slot, value)
-                except Exception as ex:
-                    logger.exception("error while updating account {}", account.key, exception=ex)
+        groups = [accounts[i:i+MAX_MULTIPLE_ACCOUNTS] for i in range(0, len(accounts), MAX_MULTIPLE_ACCOUNTS)]
+        batch_size = max(self.max_batch_requests, 1)
+        tasks = [
+            asyncio.ensure_future(update_groups(groups[i:i+batch_size]))
+            for i in range(0, len(groups), batch_size)
+        ]
+        try:
+            results: List[List[int]] = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        slots = [slot for result in results for slot in result]
+        if not slots:
+            return None, None
+        return min(slots), max(slots)
 
     async def http_send(self, method: str, params: Optional[List[Any]] = None, *, return_error: bool = False) -> Any:
         if self.ratelimit:
@@ -231,7 +494,7 @@ class SolanaClient:
         ) as resp:
             if resp.status == 429:  # rate-limited (429 Too Many Requests)
                 raise RateLimitedException()
-            data = await resp.json()
+            data = codec.loads(await resp.read())
             if not isinstance(data, dict):
                 raise SolanaException(f"got non-JSON-object {type(data)} from Solana")
             data = cast(Dict[str, Any], data)
@@ -240,12 +503,57 @@ class SolanaClient:
                 raise SolanaException(
                     f"got response with ID {received_id} to request with ID {id}"
                 )
-            error: Any = data.get("error")
-            if error and not return_error:
-                raise SolanaException(
-                    f"Solana RPC error: {error['code']} {error['message']}", error
-                )
-            return error or data.get("result")
+            return _get_jsonrpc_result(data, return_error)
+
+    async def http_send_batch(
+        self,
+        requests: Sequence[Tuple[str, Optional[List[Any]]]],
+        *,
+        return_error: bool = False,
+    ) -> List[Any]:
+        """
+        Sends several (method, params) calls in one JSON-RPC batch request.
+
+        Returns the results in the order of the requests. The batch counts
+        as a single request against the rate limit.
+        """
+        responses = await self._http_send_batch(requests)
+        return [_get_jsonrpc_result(response, return_error) for response in responses]
+
+    async def _http_send_batch(self, requests: Sequence[Tuple[str, Optional[List[Any]]]]) -> List[Dict[str, Any]]:
+        if not requests:
+            return []
+        methods = set(method for method, _ in requests)
+        if self.ratelimit:
+            await self.ratelimit.apply_method(methods.pop() if len(methods) == 1 else "batch", True)
+        ids = [self._get_next_id() for _ in requests]
+        async with self._get_client().post(
+            self.endpoint, json=[_make_jsonrpc(id, method, params) for id, (method, params) in zip(ids, requests)]
+        ) as resp:
+            if resp.status == 429:  # rate-limited (429 Too Many Requests)
+                raise RateLimitedException()
+            data = codec.loads(await resp.read())
+            if not isinstance(data, list):
+                if isinstance(data, dict) and data.get("error"):
+                    _get_jsonrpc_result(cast(Dict[str, Any], data), False)
+                raise SolanaException(f"got non-JSON-array {type(data)} from Solana batch request")
+            responses: Dict[Any, Dict[str, Any]] = dict(
+                (response.get("id"), response) for response in cast(List[Dict[str, Any]], data)
+            )
+            ordered: List[Dict[str, Any]] = []
+            for id in ids:
+                response = responses.get(id)
+                if response is None:
+                    raise SolanaException(f"got no response to batched request with ID {id}")
+                ordered.append(response)
+            return ordered
+
+    def batch(self) -> SolanaBatchRequest:
+        """
+        Creates a SolanaBatchRequest that queues calls to send them in a single
+        JSON-RPC batch.
+        """
+        return SolanaBatchRequest(self)
 
     async def get_account_info(
         self,
@@ -269,12 +577,22 @@ class SolanaClient:
         key: SolanaPublicKeyOrStr,
         commitment: str = SolanaCommitment.CONFIRMED,
         encoding: str = "base64",
-        with_context: bool = True
+        with_context: bool = True,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        data_slice: Optional[Tuple[int, int]] = None,
     ) -> Dict[str, Any]:
-        return await self.http_send(
-            "getProgramAccounts",
-            [str(key), {"commitment": commitment, "encoding": encoding, "withContext": with_context}],
-        )
+        """
+        Gets the accounts owned by the given program.
+
+        Args:
+            filters: only return accounts matching all of these filters (see
+                memcmp_filter and data_size_filter)
+            data_slice: only return length bytes of account data starting at
+                offset, as an (offset, length) tuple
+        """
+        config = _make_program_accounts_config(commitment, encoding, filters, data_slice)
+        config["withContext"] = with_context
+        return await self.http_send("getProgramAccounts", [str(key), config])
 
     async def get_balance(
         self,
@@ -326,10 +644,21 @@ class SolanaClient:
         key: SolanaPublicKeyOrStr,
         commitment: str = SolanaCommitment.CONFIRMED,
         encoding: str = "base64",
+        filters: Optional[List[Dict[str, Any]]] = None,
+        data_slice: Optional[Tuple[int, int]] = None,
     ):
+        """
+        Subscribes to changes of the accounts owned by the given program.
+
+        Args:
+            filters: only notify about accounts matching all of these filters
+                (see memcmp_filter and data_size_filter)
+            data_slice: only send length bytes of account data starting at
+                offset, as an (offset, length) tuple
+        """
         return await self.ws_send(
             "programSubscribe",
-            [str(key), {"commitment": commitment, "encoding": encoding}],
+            [str(key), _make_program_accounts_config(commitment, encoding, filters, data_slice)],
         )
 
     async def ws_program_unsubscribe(self, subscription_id: int):
@@ -355,48 +684,109 @@ class SolanaClient:
         max_value=config.get_backoff_max_value,
     )
     async def ws_connect(self):
-        if self.ws_connected:
-            return
-        self._pending_updates = asyncio.Queue()
-        logger.debug("connecting to Solana RPC via WebSocket {}...", self.ws_endpoint)
-        self._ws = await self._get_client().ws_connect(self.ws_endpoint)
-        logger.debug("connected to Solana RPC via WebSocket")
+        if self._ws_connect_lock is None:
+            self._ws_connect_lock = asyncio.Lock()
+        async with self._ws_connect_lock:
+            if self.ws_connected:
+                return
+            self._pending_updates = self._make_update_queue()
+            logger.debug("connecting to Solana RPC via WebSocket {}...", self.ws_endpoint)
+            self._ws = await self._get_client().ws_connect(self.ws_endpoint)
+            self._ws_reader = asyncio.ensure_future(self._ws_read_loop(self._pending_updates))
+            logger.debug("connected to Solana RPC via WebSocket")
 
     async def ws_disconnect(self):
         if not self.ws_connected:
             return
         assert self._ws
         logger.debug("closing Solana RPC WebSocket connection...")
+        await self._ws_stop_reader()
         await self._ws.close()
         logger.debug("closed Solana RPC WebSocket connection")
         self._ws = None
+        closed = WebSocketClosedException("WebSocket closed by client")
+        self._ws_fail_responses(closed)
+        # wake up anyone waiting for an update on this connection
+        self._pending_updates.close(closed)
+
+    async def _ws_stop_reader(self):
+        reader, self._ws_reader = self._ws_reader, None
+        if reader is None or reader.done():
+            return
+        reader.cancel()
+        await asyncio.wait([reader])
+
+    def _ws_fail_responses(self, exception: BaseException):
+        responses, self._ws_responses = self._ws_responses, {}
+        for future in responses.values():
+            if not future.done():
+                future.set_exception(exception)
 
     async def ws_send(self, method: str, params: List[Any]):
+        """
+        Sends a JSON-RPC request over the WebSocket and waits for its response.
+
+        Several requests may be in flight at once; responses are matched to
+        requests by id by the WebSocket reader task.
+        """
         await self.ws_connect()
         if self.ratelimit:
             await self.ratelimit.apply_method(method, True)
         assert self._ws
+        if self._ws_reader is None or self._ws_reader.done():
+            raise WebSocketClosedException("WebSocket reader has stopped")
         id = self._get_next_id()
-        await self._ws.send_str(json.dumps(_make_jsonrpc(id, method, params)))
-        return await self._ws_wait_response(id)
-
-    async def _ws_wait_response(self, id: int):
-        while True:
-            msg = json.loads(await self._ws_receive_str())
-            if "method" in msg:
-                self._pending_updates.put_nowait(msg)
-                continue
-            received_id = msg.get("id")
-            if received_id != id:
-                raise SolanaException(
-                    f"got response with ID {received_id} to request with ID {id}"
-                )
-            error = msg.get("error")
-            if error:
-                raise SolanaException(
-                    f"Solana RPC error: {error['code']} {error['message']}", error
-                )
-            return msg.get("result")
+        future: asyncio.Future[Any] = asyncio.get_event_loop().create_future()
+        self._ws_responses[id] = future
+        # the reader may be holding off reading for a slow consumer
+        self._pending_updates.wake()
+        try:
+            await self._ws.send_str(codec.dumps(_make_jsonrpc(id, method, params)))
+            return await future
+        finally:
+            self._ws_responses.pop(id, None)
+
+    async def _ws_read_loop(self, updates: SolanaUpdateQueue):
+        # reads every message from the WebSocket: notifications are queued for
+        # get_next_update, responses resolve the future of their request
+        try:
+            while True:
+                # with the BLOCK policy, leave notifications unread while the
+                # consumer catches up, but not responses to pending requests
+                while updates.policy == SolanaUpdateQueuePolicy.BLOCK and updates.full() and not self._ws_responses:
+                    await updates.wait_for_room()
+                frame = await self._ws_receive_str()
+                # a frame we cannot decode is dropped; only connection errors
+                # end the reader
+                try:
+                    msg = codec.decode_ws_message(frame)
+                except Exception as e:
+                    logger.warning("failed to decode WebSocket message {!r}: {}", frame[:200], e)
+                    continue
+                if not isinstance(msg, (codec.AccountNotification, dict)):
+                    logger.warning("got unexpected WebSocket message: {!r}", frame[:200])
+                    continue
+                if isinstance(msg, codec.AccountNotification) or "method" in msg:
+                    updates.put_nowait(msg)
+                    continue
+                future = self._ws_responses.pop(msg.get("id"), None)
+                if future is None:
+                    logger.warning("got WebSocket response to unknown request: {}", msg)
+                    continue
+                if future.done():
+                    continue
+                error = msg.get("error")
+                if error:
+                    future.set_exception(SolanaException(
+                        f"Solana RPC error: {error['code']} {error['message']}", error
+                    ))
+                else:
+                    future.set_result(msg.get("result"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._ws_fail_responses(e)
+            updates.close(e)
 
     async def _ws_receive_str(self) -> str:
         # aiohttp's receive_str throws a very cryptic error when the
@@ -413,12 +803,172 @@ class SolanaClient:
         return wsmsg.data # type: ignore  # missing type information
 
     async def get_next_update(self) -> Dict[str, Any]:
-        if not self._pending_updates.empty():
-            return self._pending_updates.get_nowait()
-        msg = json.loads(await self._ws_receive_str())
-        if "method" not in msg:
-            raise SolanaException(f"unexpected RPC response", msg)
-        return msg
+        """
+        Waits for the next notification received on the WebSocket.
+
+        Raises WebSocketClosedException if the WebSocket is or gets closed.
+        """
+        update = await self.get_next_notification()
+        if isinstance(update, codec.AccountNotification):
+            return update.message
+        return update
+
+    async def get_next_notification(self) -> Union[codec.AccountNotification, Dict[str, Any]]:
+        """
+        Waits for the next notification received on the WebSocket, like
+        get_next_update, but returns account and program notifications as
+        codec.AccountNotification objects without decoding the whole message.
+
+        Raises WebSocketClosedException if the WebSocket is or gets closed.
+        """
+        while True:
+            updates = self._pending_updates
+            if updates.empty() and not updates.closed and (self._ws_reader is None or self._ws_reader.done()):
+                raise WebSocketClosedException("WebSocket is not connected")
+            try:
+                return await updates.get()
+            except Exception:
+                if updates is not self._pending_updates:
+                    # we were waiting on a connection that has since been replaced
+                    continue
+                raise
+
+    async def get_next_notifications(
+        self, max_items: int, max_wait: Optional[float] = None
+    ) -> List[Union[codec.AccountNotification, Dict[str, Any]]]:
+        """
+        Waits up to max_wait seconds (or forever if None) for the next
+        notification, then returns it together with the notifications already
+        received after it, up to max_items in total. Returns an empty list if
+        no notification arrives in time.
+
+        Raises WebSocketClosedException if the WebSocket is or gets closed
+        before the first notification.
+        """
+        updates = self._pending_updates
+        notifications: List[Union[codec.AccountNotification, Dict[str, Any]]] = []
+        if updates.empty():
+            reader_running = self._ws_reader is not None and not self._ws_reader.done()
+            if max_wait is not None and max_wait <= 0:
+                if reader_running and not updates.closed:
+                    return []
+                # raises straight away
+                max_wait = None
+            try:
+                notifications.append(await asyncio.wait_for(self.get_next_notification(), max_wait))
+            except asyncio.TimeoutError:
+                return []
+            updates = self._pending_updates
+        while len(notifications) < max_items and not updates.empty():
+            notifications.append(updates.get_nowait())
+        return notifications
+
+
+class SolanaBatchRequest:
+    """
+    Queues JSON-RPC calls to send them to Solana in a single batch request.
+
+    Each queued call returns a future which gets the call's result (or
+    exception) once send() is awaited.
+    """
+
+    def __init__(self, client: SolanaClient) -> None:
+        self._client = client
+        self._requests: List[Tuple[str, Optional[List[Any]]]] = []
+        self._futures: List[asyncio.Future[Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, method: str, params: Optional[List[Any]] = None) -> asyncio.Future[Any]:
+        future: asyncio.Future[Any] = asyncio.get_event_loop().create_future()
+        self._requests.append((method, params))
+        self._futures.append(future)
+        return future
+
+    def get_account_info(
+        self,
+        key: Union[SolanaPublicKeyOrStr, Sequence[SolanaPublicKeyOrStr]],
+        commitment: str = SolanaCommitment.CONFIRMED,
+        encoding: str = "base64",
+    ) -> asyncio.Future[Any]:
+        if isinstance(key, Sequence) and not isinstance(key, str):
+            return self.add(
+                "getMultipleAccounts",
+                [[str(k) for k in key], {"commitment": commitment, "encoding": encoding}],
+            )
+        else:
+            return self.add(
+                "getAccountInfo",
+                [str(key), {"commitment": commitment, "encoding": encoding}],
+            )
+
+    def get_balance(self, key: SolanaPublicKeyOrStr, commitment: str = SolanaCommitment.CONFIRMED) -> asyncio.Future[Any]:
+        return self.add("getBalance", [str(key), {"commitment": commitment}])
+
+    def get_block_time(self, slot: int) -> asyncio.Future[Any]:
+        return self.add("getBlockTime", [slot])
+
+    def get_slot(self, commitment: str = SolanaCommitment.CONFIRMED) -> asyncio.Future[Any]:
+        return self.add("getSlot", [{"commitment": commitment}])
+
+    async def send(self) -> None:
+        """
+        Sends all queued calls and resolves their futures.
+        """
+        requests, futures = self._requests, self._futures
+        self._requests, self._futures = [], []
+        try:
+            responses = await self._client._http_send_batch(requests)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        for future, response in zip(futures, responses):
+            try:
+                future.set_result(_get_jsonrpc_result(response, False))
+            except SolanaException as e:
+                future.set_exception(e)
+
+
+def memcmp_filter(offset: int, data: bytes) -> Dict[str, Any]:
+    """
+    Builds a getProgramAccounts/programSubscribe filter matching accounts
+    whose data contains the given bytes at the given offset.
+    """
+    return {"memcmp": {"offset": offset, "bytes": base58.b58encode(data).decode("ascii")}}
+
+
+def data_size_filter(size: int) -> Dict[str, Any]:
+    """
+    Builds a getProgramAccounts/programSubscribe filter matching accounts
+    whose data is exactly size bytes long.
+    """
+    return {"dataSize": size}
+
+
+def _make_program_accounts_config(
+    commitment: str,
+    encoding: str,
+    filters: Optional[List[Dict[str, Any]]],
+    data_slice: Optional[Tuple[int, int]],
+) -> Dict[str, Any]:
+    config: Dict[str, Any] = {"commitment": commitment, "encoding": encoding}
+    if filters:
+        config["filters"] = filters
+    if data_slice is not None:
+        offset, length = data_slice
+        config["dataSlice"] = {"offset": offset, "length": length}
+    return config
+
+
+def _get_jsonrpc_result(data: Dict[str, Any], return_error: bool) -> Any:
+    error: Any = data.get("error")
+    if error and not return_error:
+        raise SolanaException(
+            f"Solana RPC error: {error['code']} {error['message']}", error
+        )
+    return error or data.get("result")
 
 
 def _make_jsonrpc(id: int, method: str, params: Optional[List[Any]]) -> Dict[str, Any]:
@@ -27,6 +27,8 @@ setup(
     extras_require={
         'testing': requirements + ['mock', 'pytest', 'pytest-cov', 'pytest-socket',
                                    'pytest-mock', 'pytest-asyncio'],
+        'fast': ['msgspec', 'orjson'],
+        'numpy': ['numpy'],
     },
     python_requires='>=3.9.0',
 )
@@ -0,0 +1,100 @@
+import pytest
+
+from pythclient import codec
+
+
+@pytest.fixture
+def restore_backend():
+    previous = codec.backend
+    yield
+    codec.use(previous)
+
+
+@pytest.mark.parametrize("name", codec.AVAILABLE_BACKENDS)
+def test_backend_round_trip(restore_backend, name: str) -> None:
+    try:
+        codec.use(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+    assert codec.backend == name
+    msg = {"jsonrpc": "2.0", "id": 1, "params": [{"value": [123, None, "x"]}]}
+    encoded = codec.dumps(msg)
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == msg
+    assert codec.loads(encoded.encode("utf-8")) == msg
+
+
+def test_unknown_backend(restore_backend) -> None:
+    with pytest.raises(ValueError):
+        codec.use("yaml")
+
+
+ACCOUNT_NOTIFICATION = {
+    "jsonrpc": "2.0",
+    "method": "accountNotification",
+    "params": {
+        "subscription": 7,
+        "result": {
+            "context": {"slot": 1000},
+            "value": {"data": ["AAAA", "base64"], "executable": False, "lamports": 5, "owner": "x", "rentEpoch": 1},
+        },
+    },
+}
+
+PROGRAM_NOTIFICATION = {
+    "jsonrpc": "2.0",
+    "method": "programNotification",
+    "params": {
+        "subscription": 8,
+        "result": {
+            "context": {"slot": 1001},
+            "value": {"pubkey": "key", "account": {"data": ["BBBB", "base64"], "lamports": 6, "owner": "x"}},
+        },
+    },
+}
+
+DECODERS = [codec._decode_ws_message_generic]
+if codec.msgspec is not None:
+    DECODERS.append(codec._decode_ws_message_typed)
+
+
+@pytest.mark.parametrize("decode", DECODERS)
+def test_decode_account_notification(decode) -> None:
+    msg = decode(codec.dumps(ACCOUNT_NOTIFICATION))
+    assert isinstance(msg, codec.AccountNotification)
+    assert (msg.method, msg.subscription, msg.slot, msg.pubkey) == ("accountNotification", 7, 1000, None)
+    assert msg.value == {"data": ["AAAA", "base64"], "lamports": 5}
+    if decode is not codec._decode_ws_message_generic:
+        # the typed decoder does not build the full message unless asked to
+        assert msg._message is None
+    assert msg.message == ACCOUNT_NOTIFICATION
+
+
+@pytest.mark.parametrize("decode", DECODERS)
+def test_decode_program_notification(decode) -> None:
+    msg = decode(codec.dumps(PROGRAM_NOTIFICATION))
+    assert isinstance(msg, codec.AccountNotification)
+    assert (msg.method, msg.subscription, msg.slot, msg.pubkey) == ("programNotification", 8, 1001, "key")
+    assert msg.value == {"data": ["BBBB", "base64"], "lamports": 6}
+    assert msg.message == PROGRAM_NOTIFICATION
+
+
+@pytest.mark.parametrize("decode", DECODERS)
+def test_decode_other_messages(decode) -> None:
+    response = decode('{"jsonrpc": "2.0", "id": 3, "result": 12}')
+    assert response["id"] == 3 and response["result"] == 12 and not response.get("error")
+    slot = {"jsonrpc": "2.0", "method": "slotNotification", "params": {"subscription": 1, "result": {"slot": 5}}}
+    assert decode(codec.dumps(slot)) == slot
+
+
+@pytest.mark.parametrize("name", codec.AVAILABLE_BACKENDS)
+def test_decode_ws_message_uses_backend(restore_backend, name: str) -> None:
+    try:
+        codec.use(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+    expected = codec._decode_ws_message_typed if name == "msgspec" else codec._decode_ws_message_generic
+    assert codec._decode_ws_message is expected
+    msg = codec.decode_ws_message(codec.dumps(ACCOUNT_NOTIFICATION))
+    assert isinstance(msg, codec.AccountNotification)
+    assert msg.message == ACCOUNT_NOTIFICATION
@@ -0,0 +1,37 @@
+from pythclient import layouts
+from pythclient.pythaccounts import (
+    ACCOUNT_HEADER_BYTES, PythPriceAccount, PythPriceComponent, PythPriceInfo, PythPriceStatus, _VERSION_1
+)
+from pythclient.solana import SolanaClient, SolanaPublicKey
+
+
+def test_layout_sizes() -> None:
+    assert layouts.ACCOUNT_HEADER.size == ACCOUNT_HEADER_BYTES
+    assert layouts.PRICE_INFO.size == PythPriceInfo.LENGTH
+    assert layouts.PRICE_COMPONENT.size == PythPriceComponent.LENGTH
+    assert layouts.PRICE_V1.size == 128
+    assert layouts.PRICE_V2.size == 192
+    assert layouts.PRICE_V2_WITH_AGGREGATE.size == layouts.PRICE_V2.size + PythPriceInfo.LENGTH
+
+
+def test_price_account_v1(solana_client: SolanaClient) -> None:
+    product_key = SolanaPublicKey(bytes(range(1, 33)))
+    publisher_key = SolanaPublicKey(bytes(range(2, 34)))
+    buffer = (
+        layouts.PRICE_V1_WITH_AGGREGATE.pack(
+            1, -2, 1, 0, 11, 10, bytes(range(1, 33)),
+            bytes(32), bytes(32), 12345, 6, 1, 0, 10)
+        + layouts.PRICE_COMPONENT.pack(bytes(range(2, 34)), 12340, 5, 1, 0, 9, 12350, 7, 1, 0, 10)
+    )
+    account = PythPriceAccount(SolanaPublicKey(bytes(32)), solana_client)
+    account.update_from(buffer, version=_VERSION_1)
+
+    assert account.exponent == -2
+    assert account.valid_slot == 10
+    assert account.product_account_key == product_key
+    assert account.next_price_account_key is None
+    assert account.aggregate_price_info == PythPriceInfo(12345, 6, PythPriceStatus.TRADING, 10, -2)
+    assert len(account.price_components) == 1
+    assert account.price_components[0].publisher_key == publisher_key
+    assert account.price_components[0].latest_price_info.raw_price == 12350
+    assert account.timestamp == 0
@@ -0,0 +1,82 @@
+import base64
+
+import pytest
+from mock import AsyncMock
+from pytest_mock import MockerFixture
+
+from pythclient.pricebatch import PythPriceBatch
+from pythclient.pythaccounts import PythPriceStatus, PythPriceType
+from pythclient.pythclient import PythClient
+from pythclient.solana import SolanaClient
+
+from pyth_account_data import (
+    BCH_PRICE_ACCOUNT_KEY,
+    BCH_PRODUCT_ACCOUNT_KEY,
+    PRICE_ACCOUNT_B64_DATA,
+    PRODUCT_ACCOUNT_B64_DATA,
+    V2_FIRST_MAPPING_ACCOUNT_KEY,
+    V2_PROGRAM_KEY,
+    get_program_accounts_resp,
+)
+
+
+def test_price_batch_from_program_accounts() -> None:
+    batch = PythPriceBatch.from_program_accounts(get_program_accounts_resp(V2_PROGRAM_KEY))
+
+    # mapping and product accounts are skipped
+    assert len(batch) == 1
+    assert batch.slot == 96866599
+    assert batch.keys == [BCH_PRICE_ACCOUNT_KEY]
+    assert BCH_PRICE_ACCOUNT_KEY in batch
+    assert batch.index_of(BCH_PRICE_ACCOUNT_KEY) == 0
+    assert batch.price_type[0] == PythPriceType.PRICE.value
+    assert batch.exponent[0] == -9
+    assert batch.num_components[0] == 27
+    assert batch.last_slot[0] == 96878111
+    assert batch.valid_slot[0] == 96878110
+    assert batch.price_status[0] == PythPriceStatus.TRADING.value
+
+
+def test_price_batch_matches_price_account(solana_client: SolanaClient) -> None:
+    batch = PythPriceBatch.from_buffers([
+        (BCH_PRODUCT_ACCOUNT_KEY, base64.b64decode(PRODUCT_ACCOUNT_B64_DATA)),
+        (BCH_PRICE_ACCOUNT_KEY, base64.b64decode(PRICE_ACCOUNT_B64_DATA)),
+    ], slot=1)
+    assert len(batch) == 1
+
+    account = batch.price_account(0, solana_client)
+    assert account.slot == 1
+    assert str(account.key) == BCH_PRICE_ACCOUNT_KEY
+    assert len(account.price_components) == 27
+    assert account.aggregate_price_info == batch.aggregate_price_info(0)
+    assert batch.price[0] == account.aggregate_price_info.price
+    assert batch.confidence_interval[0] == account.aggregate_price_info.confidence_interval
+    assert batch.timestamp[0] == account.timestamp
+
+
+@pytest.mark.asyncio
+async def test_get_price_batch(solana_client: SolanaClient, mocker: MockerFixture) -> None:
+    mocker.patch('pythclient.solana.SolanaClient.get_program_accounts',
+                 side_effect=AsyncMock(side_effect=get_program_accounts_resp))
+    client = PythClient(
+        solana_client=solana_client,
+        first_mapping_account_key=V2_FIRST_MAPPING_ACCOUNT_KEY,
+        program_key=V2_PROGRAM_KEY,
+    )
+    batch = await client.get_price_batch()
+    assert batch.keys == [BCH_PRICE_ACCOUNT_KEY]
+    assert len(batch.price_account(0, solana_client).price_components) == 27
+
+    aggregate_batch = await client.get_price_batch(aggregate_only=True)
+    assert list(aggregate_batch.raw_price) == list(batch.raw_price)
+    assert list(aggregate_batch.num_components) == [27]
+    account = aggregate_batch.price_account(0, solana_client)
+    assert account.aggregate_price_info == batch.aggregate_price_info(0)
+    assert len(account.price_components) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_price_batch_no_program_key(solana_client: SolanaClient) -> None:
+    client = PythClient(solana_client=solana_client, first_mapping_account_key=V2_FIRST_MAPPING_ACCOUNT_KEY)
+    with pytest.raises(ValueError):
+        await client.get_price_batch()
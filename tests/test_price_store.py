@@ -0,0 +1,97 @@
+import pytest
+
+from pythclient import pricestore
+from pythclient.pricestore import PythPriceStore, update_price_sink
+from pythclient.pythaccounts import PythPriceAccount, PythPriceInfo, PythPriceStatus
+from pythclient.solana import SolanaClient, SolanaPublicKey
+
+
+def make_price_account(
+    solana_client: SolanaClient, i: int, raw_price: int, raw_conf: int, status: PythPriceStatus
+) -> PythPriceAccount:
+    account = PythPriceAccount(SolanaPublicKey(bytes([i + 1] * 32)), solana_client)
+    account.aggregate_price_info = PythPriceInfo(raw_price, raw_conf, status, 100 + i, -2)
+    account.valid_slot = 99 + i
+    account.slot = 101 + i
+    return account
+
+
+@pytest.fixture(params=["numpy", "array"])
+def store(request, monkeypatch) -> PythPriceStore:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pricestore, "numpy", None)
+    return PythPriceStore()
+
+
+def test_price_store_update_in_place(store: PythPriceStore, solana_client: SolanaClient) -> None:
+    account = make_price_account(solana_client, 0, 10000, 10, PythPriceStatus.TRADING)
+    assert store.update(account) == 0
+    assert store.update(make_price_account(solana_client, 1, 500, 5, PythPriceStatus.TRADING)) == 1
+
+    account.aggregate_price_info = PythPriceInfo(12000, 20, PythPriceStatus.HALTED, 150, -2)
+    assert store.update(account) == 0
+
+    assert len(store) == 2
+    assert store.index_of(account.key) == 0
+    assert account.key in store
+    assert list(store.column("raw_price")) == [12000, 500]
+    assert list(store.column("price")) == [120.0, 5.0]
+    assert list(store.column("price_status")) == [PythPriceStatus.HALTED.value, PythPriceStatus.TRADING.value]
+    assert store.update(PythPriceAccount(SolanaPublicKey(bytes(32)), solana_client)) is None
+
+
+def test_price_store_select(store: PythPriceStore, solana_client: SolanaClient) -> None:
+    accounts = [
+        make_price_account(solana_client, 0, 10000, 10, PythPriceStatus.TRADING),
+        make_price_account(solana_client, 1, 10000, 1000, PythPriceStatus.TRADING),
+        make_price_account(solana_client, 2, -10000, 10, PythPriceStatus.TRADING),
+        make_price_account(solana_client, 3, 10000, 10, PythPriceStatus.HALTED),
+    ]
+    for account in accounts:
+        store.update(account)
+    keys = [str(account.key) for account in accounts]
+
+    assert store.select() == keys[:3]
+    assert store.select(max_confidence_ratio=0.01) == [keys[0], keys[2]]
+    assert store.select(price_status=None, max_confidence_ratio=0.01, min_pub_slot=101) == [keys[2], keys[3]]
+
+
+def test_price_store_snapshot(store: PythPriceStore, solana_client: SolanaClient) -> None:
+    account = make_price_account(solana_client, 0, 10000, 10, PythPriceStatus.TRADING)
+    store.update(account)
+    snapshot = store.snapshot()
+    account.aggregate_price_info = PythPriceInfo(1, 1, PythPriceStatus.TRADING, 1, -2)
+    store.update(account)
+    assert snapshot["keys"] == [str(account.key)]
+    assert list(snapshot["raw_price"]) == [10000]
+    assert list(snapshot["slot"]) == [101]
+
+
+def test_update_price_sink_logs_errors(solana_client: SolanaClient) -> None:
+    class FullSink:
+        def update(self, account: PythPriceAccount) -> int:
+            raise ValueError("full")
+
+    account = make_price_account(solana_client, 0, 10000, 10, PythPriceStatus.TRADING)
+    assert update_price_sink(FullSink(), account) is None
+    assert update_price_sink(PythPriceStore(), account) == 0
+
+
+def test_price_store_add_row_with_view(solana_client: SolanaClient) -> None:
+    numpy = pytest.importorskip("numpy")
+    store = PythPriceStore()
+    store.update(make_price_account(solana_client, 0, 10000, 10, PythPriceStatus.TRADING))
+    view = store.column("pub_slot")
+    assert isinstance(view, numpy.ndarray)
+
+    account = make_price_account(solana_client, 1, 500, 5, PythPriceStatus.TRADING)
+    with pytest.raises(BufferError):
+        store.update(account)
+    assert len(store) == 1 and account.key not in store
+    assert all(len(store.column(name)) == 1 for name in pricestore.COLUMNS)
+
+    del view
+    assert store.update(account) == 1
+    assert list(store.column("raw_price")) == [10000, 500]
@@ -1,96 +1,38 @@
-from typing import Any, Dict, Union, Sequence, List
+from typing import Any, Callable, Dict, Optional, Union, Sequence, List
 import pytest
+import asyncio
 import base64
+from pythclient import layouts
 from pythclient.exceptions import NotLoadedException
 from pythclient.pythaccounts import (
-    ACCOUNT_HEADER_BYTES, _VERSION_2, PythMappingAccount, PythPriceType, PythProductAccount, PythPriceAccount
+    ACCOUNT_HEADER_BYTES, PRICE_AGGREGATE_DATA_LENGTH, _VERSION_2, PythAccountType, PythMappingAccount, PythPriceType,
+    PythProductAccount, PythPriceAccount, account_type_filter, check_price_changes
 )
 
 from pythclient.pythclient import PythClient, WatchSession
+from pythclient.pricestore import PythPriceStore
 from pythclient.solana import (
+    SolanaAccount,
     SolanaClient,
-    SolanaCommitment,
     SolanaPublicKey,
-    SolanaPublicKeyOrStr
+    SolanaPublicKeyOrStr,
+    SolanaUpdateQueuePolicy
 )
 
 from pytest_mock import MockerFixture
 
 from mock import AsyncMock
 
-
-# Using constants instead of fixtures because:
-# 1) these values are not expected to be mutated
-# 2) these values are used in get_account_info_resp() and get_program_accounts_resp()
-#    and so if they are passed in as fixtures, the functions will complain for the args
-#    while mocking the respective functions
-V2_FIRST_MAPPING_ACCOUNT_KEY = 'BmA9Z6FjioHJPpjT39QazZyhDRUdZy2ezwx4GiDdE2u2'
-V2_PROGRAM_KEY = 'gSbePebfvPy7tRqimPoVecS2UsBvYv46ynrzWocc92s'
-
-BCH_PRODUCT_ACCOUNT_KEY = '89GseEmvNkzAMMEXcW9oTYzqRPXTsJ3BmNerXmgA1osV'
-BCH_PRICE_ACCOUNT_KEY = '4EQrNZYk5KR1RnjyzbaaRbHsv8VqZWzSUtvx58wLsZbj'
-
-MAPPING_ACCOUNT_B64_DATA = ('1MOyoQIAAAABAAAAWAAAAAEAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABqIGcc'
-                            'Dj+MshnOP0blrglqTy/fk20r1NqJJfcAh9Ud2A==')
-PRODUCT_ACCOUNT_B64_DATA = ('1MOyoQIAAAACAAAAlwAAADAClHlZh5cpDjY4oXEsKb3iNn0OynlPd4sltaRy8ZLeBnN5bWJvbAdCQ0gv'
-                            'VVNECmFzc2V0X3R5cGUGQ3J5cHRvDnF1b3RlX2N1cnJlbmN5A1VTRAtkZXNjcmlwdGlvbgdCQ0gvVVNE'
-                            'DmdlbmVyaWNfc3ltYm9sBkJDSFVTRARiYXNlA0JDSA==')
-PRICE_ACCOUNT_B64_DATA = ('1MOyoQIAAAADAAAAEAsAAAEAAAD3////GwAAAAIAAAAfPsYFAAAAAB4+xgUAAAAA0B+GxYIAAAB/xYqq'
-                          'AAAAADy4oy8BAAAAtPuFGgAAAAC8tR2HAAAAADy4oy8BAAAAAQAAAAAAAAAAAAAAAAAAAGogZxwOP4yy'
-                          'Gc4/RuWuCWpPL9+TbSvU2okl9wCH1R3YAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAdPsYF'
-                          'AAAAACB1G8yCAAAASJxHLgAAAAAvuzCkNjwQn8DZCsmCAAAASCynLwAAAAABAAAAAAAAAB8+xgUAAAAA'
-                          'Qlxb88UapZ0T6mWzABhtX/lDiPrAaUMbsl4vmXpBgd4AI6GaggAAAICFtQ0AAAAAAQAAAAAAAAAdPsYF'
-                          'AAAAAIATnJ2CAAAAAJW6CgAAAAABAAAAAAAAAB4+xgUAAAAAopQU2JDnE5ZYJwruatN5x2coYY19zVBC'
-                          'tyZbiKhxYksAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAkH6Erg47Ci94ZGUUYRxRICzgpNlfaIVeXC3eoge5K66z0OUXhQAAANMiBSEAAAAA'
-                          'AQAAAAAAAABqYa8FAAAAALPQ5ReFAAAA0yIFIQAAAAABAAAAAAAAAGphrwUAAAAAJyCj9u7+AUmDcI1H'
-                          'T9GvlDfStBYeQB5YYZZZsDQht+AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAHkXfq/XM16tovM/VgEWSsYzNZhi/J9PvVgRbUtqgcg8dWmr8'
-                          'ggAAADjoaxIAAAAAAQAAAAAAAAAcPsYFAAAAAIn1Af2CAAAAi/1rEgAAAAABAAAAAAAAAB0+xgUAAAAA'
-                          'E3YWCAU39ntOTBHgm48UMpFVs7DvUTFB/bbaq/vZeC4AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAXp50gnYmYi6R4+I+QnSWi4H88VJKoIye'
-                          '5Uqoweh9l+UAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAZk/hVoPBHzoEnahGCoRrjFSg5bWEvDQW7clr70r1C8UAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAquLwEjnZE1h1qKp9'
-                          'mpfiZ+fqJ1Rw3cLhX8nrx0VgKfEA599MkQAAAAB2sBAAAAAAAQAAAAAAAADCe1wFAAAAAADn30yRAAAA'
-                          'AHawEAAAAAABAAAAAAAAAMJ7XAUAAAAANzRkq/Fg5DGQKTxjG3GJaaHanmhr9krIb1OThq282nAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'dkkNS7shgAYOa/R2+DNwiO1TuFMlP/ht6SdRU3x62T0AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAcTBWfR0upQv8cz+gPNHNt0GPnKBaObi9'
-                          'LAKefxb5wtsAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAA1FflJlHKD2zpeTMZ6awJhRePbFADBPK0iyu32DjydxMAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAQ4KPo2Gdpryu1okX'
-                          '3h18zpIX3scrrhIwY/97590vlj7AoFlfkAAAAMDXGTAAAAAAAQAAAAAAAACokB0FAAAAAMCgWV+QAAAA'
-                          'wNcZMAAAAAABAAAAAAAAAKiQHQUAAAAAf7Bx65O+Q/eDp7AcK8Lw03LmNh99Mpfu5nsydLpn2MUAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'GxE1Ex2rDAJyecg2P8ogqo9tPGKaDqZCf0+OHUfLz/EIHZd/hAAAALmp0SQAAAAAAQAAAAAAAADBxLcF'
-                          'AAAAAAgdl3+EAAAAuanRJAAAAAABAAAAAAAAAMHEtwUAAAAAskWdp1YAT2k7uotwDoVkx9WSY7gay8uo'
-                          'ykAsyQ6FrusAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAArq/eOgx1mU6Ixigj8cizk6fgfgXNTYnoHl9La1kz/CeAeCunjgAAAIDLeDEAAAAA'
-                          'AQAAAAAAAABMtDcFAAAAAIB4K6eOAAAAgMt4MQAAAAABAAAAAAAAAEy0NwUAAAAA5v6vZs5/Kw4Sf3Gf'
-                          'jLwRpg0NfHtESw5mRqECMnlwNLsAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAZFIJBu0qw/EJSssd8apY//Qv+Wl5hRi697NmiqraVk0AAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAADhxFoFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAOHEWgUAAAAA'
-                          'jmNjneYqRRu77K9pGMTM31Dr7Hq6X3CAdoTOnMfxvKYAL4BmjwAAAIDR8AgAAAAAAQAAAAAAAAAch0YF'
-                          'AAAAAAAvgGaPAAAAgNHwCAAAAAABAAAAAAAAAByHRgUAAAAAU8TtEyg6nKJ630rA85k7MfQylqJgcsND'
-                          '5LnQsZ7hpLurmVVTjwAAAADC6wsAAAAAAQAAAAAAAADMjEYFAAAAAKuZVVOPAAAAAMLrCwAAAAABAAAA'
-                          'AAAAAMyMRgUAAAAAmNhsxmReIdbBhxZ8WjXWTYNiwcVJPqEt0UqCDDpH5XYTB71SjwAAAAAcTg4AAAAA'
-                          'AQAAAAAAAADcjEYFAAAAABMHvVKPAAAAABxODgAAAAABAAAAAAAAANyMRgUAAAAATvf0GXTayRqQxVor'
-                          'MaSVHlP7Byc52vz8WQF/b2TeHGsvK9hRjwAAAIDfFxAAAAAAAQAAAAAAAADcjEYFAAAAAC8r2FGPAAAA'
-                          'gN8XEAAAAAABAAAAAAAAANyMRgUAAAAADcMZLVXjwPNi+/UPw5fcAP5p0QpTeiI4ES5mWhy7pWQAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAADcjEYFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAANyMRgUAAAAA'
-                          'YW9iNZroU1iQRzOa1Eib/co4u8Na3Sv0XL7nFtovGb8AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASMRtW9UzBCNs7+OA+tYXWIAuPKUTI+uG'
-                          '9WgYebtjLGYAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
-                          'AAAAAAAAAAAAAAAA')
+from pyth_account_data import (
+    BCH_PRICE_ACCOUNT_KEY,
+    BCH_PRODUCT_ACCOUNT_KEY,
+    MAPPING_ACCOUNT_B64_DATA,
+    PRICE_ACCOUNT_B64_DATA,
+    PRODUCT_ACCOUNT_B64_DATA,
+    V2_FIRST_MAPPING_ACCOUNT_KEY,
+    V2_PROGRAM_KEY,
+    get_program_accounts_resp,
+)
 
 
 def get_account_info_resp(key: Union[SolanaPublicKeyOrStr, Sequence[SolanaPublicKeyOrStr]]) -> Dict[str, Any]:
@@ -117,58 +59,6 @@ def get_account_info_resp(key: Union[SolanaPublicKeyOrStr, Sequence[SolanaPublic
     }
 
 
-def get_program_accounts_resp(key: SolanaPublicKeyOrStr,
-                              commitment: str = SolanaCommitment.CONFIRMED,
-                              encoding: str = "base64",
-                              with_context: bool = True) -> Dict[str, Any]:
-    return {
-        'context': {
-            'slot': 96866599
-        },
-        'value': [
-            {
-                'account': {
-                    'data': [
-                        MAPPING_ACCOUNT_B64_DATA,
-                        'base64'
-                    ],
-                    'executable': False,
-                    'lamports': 5143821440,
-                    'owner': V2_PROGRAM_KEY,
-                    'rentEpoch': 223
-                },
-                'pubkey': V2_FIRST_MAPPING_ACCOUNT_KEY
-            },
-            {
-                'account': {
-                    'data': [
-                        PRODUCT_ACCOUNT_B64_DATA, 'base64'
-                    ],
-                    'executable': False,
-                    'lamports': 4351231,
-                    'owner': V2_PROGRAM_KEY,
-                    'rentEpoch': 224
-                },
-                'pubkey': BCH_PRODUCT_ACCOUNT_KEY
-            },
-            {
-                'account': {
-                    'data': [
-                        PRICE_ACCOUNT_B64_DATA,
-                        'base64'
-                    ],
-                    'executable': False,
-                    'lamports': 23942400,
-                    'owner': V2_PROGRAM_KEY,
-                    'rentEpoch': 224
-                },
-                'pubkey': BCH_PRICE_ACCOUNT_KEY
-            }
-        ]
-
-    }
-
-
 @ pytest.fixture
 def pyth_client(solana_client: SolanaClient) -> PythClient:
     return PythClient(
@@ -366,6 +256,94 @@ async def test_refresh_all_prices(
         assert account.next_price_account_key is None
 
 
+@ pytest.mark.asyncio
+async def test_refresh_all_prices_price_store(
+    pyth_client: PythClient,
+    mock_get_account_info: AsyncMock,
+    mock_get_program_accounts: AsyncMock,
+    price_account: PythPriceAccount
+) -> None:
+    pyth_client.price_store = PythPriceStore()
+    await pyth_client.refresh_all_prices()
+    store = pyth_client.price_store
+    assert store.keys == [str(price_account.key)]
+    account = pyth_client.products[0].prices[PythPriceType.PRICE]
+    assert store.column("raw_price")[0] == account.aggregate_price_info.raw_price
+    assert store.column("valid_slot")[0] == 96878110
+    assert store.symbols == [pyth_client.products[0].symbol]
+
+
+@ pytest.mark.asyncio
+async def test_snapshot_round_trip(
+    pyth_client: PythClient,
+    mock_get_account_info: AsyncMock,
+    mock_get_program_accounts: AsyncMock,
+    solana_client: SolanaClient,
+    tmp_path
+) -> None:
+    await pyth_client.refresh_all_prices()
+    path = str(tmp_path / "pyth.snapshot")
+    assert pyth_client.save_snapshot(path) == 3
+
+    restored = PythClient(
+        solana_client=solana_client,
+        first_mapping_account_key=V2_FIRST_MAPPING_ACCOUNT_KEY,
+        program_key=V2_PROGRAM_KEY
+    )
+    mock_get_account_info.reset_mock()
+    mock_get_program_accounts.reset_mock()
+    assert restored.load_snapshot(path) == 96866599
+    assert not mock_get_account_info.called and not mock_get_program_accounts.called
+
+    [product] = restored.products
+    assert product.attrs == pyth_client.products[0].attrs
+    price = product.prices[PythPriceType.PRICE]
+    original = pyth_client.products[0].prices[PythPriceType.PRICE]
+    assert price.aggregate_price_info == original.aggregate_price_info
+    assert price.price_components == original.price_components
+    assert price.product is product
+
+
+def mapping_account_b64(next_key: Optional[str], entries: List[str]) -> str:
+    body = layouts.MAPPING_HEADER.pack(
+        len(entries), 0, bytes(SolanaPublicKey(next_key)) if next_key else bytes(32)
+    ) + b"".join(bytes(SolanaPublicKey(entry)) for entry in entries)
+    header = layouts.ACCOUNT_HEADER.pack(0xA1B2C3D4, _VERSION_2, 1, ACCOUNT_HEADER_BYTES + len(body))
+    return base64.b64encode(header + body).decode("ascii")
+
+
+@ pytest.mark.asyncio
+async def test_get_products_prefetches_with_next_mapping(
+    pyth_client_no_program_key: PythClient,
+    requested: List[List[str]],
+    accounts: Dict[str, str]
+) -> None:
+    second_mapping_key = str(SolanaPublicKey(bytes([7] * 32)))
+    accounts[V2_FIRST_MAPPING_ACCOUNT_KEY] = mapping_account_b64(second_mapping_key, [BCH_PRODUCT_ACCOUNT_KEY])
+    accounts[second_mapping_key] = mapping_account_b64(None, [])
+
+    products = await pyth_client_no_program_key.get_products()
+
+    # the product listed by the first mapping account comes with the second
+    assert requested == [[V2_FIRST_MAPPING_ACCOUNT_KEY], [second_mapping_key, BCH_PRODUCT_ACCOUNT_KEY]]
+    assert [str(product.key) for product in products] == [BCH_PRODUCT_ACCOUNT_KEY]
+    assert products[0].first_price_account_key == SolanaPublicKey(BCH_PRICE_ACCOUNT_KEY)
+
+
+@ pytest.mark.asyncio
+async def test_load_prices(
+    pyth_client_no_program_key: PythClient,
+    requested: List[List[str]]
+) -> None:
+    products = await pyth_client_no_program_key.get_products()
+    requested.clear()
+    await pyth_client_no_program_key.load_prices(products)
+    assert requested == [[BCH_PRICE_ACCOUNT_KEY]]
+    price = products[0].prices[PythPriceType.PRICE]
+    assert str(price.key) == BCH_PRICE_ACCOUNT_KEY
+    assert price.product is products[0]
+
+
 @ pytest.mark.asyncio
 async def test_refresh_all_prices_no_program_key(
     pyth_client_no_program_key: PythClient,
@@ -383,3 +361,212 @@ def test_create_watch_session(
 ) -> None:
     ws = pyth_client.create_watch_session()
     assert isinstance(ws, WatchSession)
+
+
+@pytest.mark.asyncio
+async def test_watch_session_subscribe_many(make_ws_client: Callable[..., SolanaClient]) -> None:
+    in_flight: List[Dict[str, Any]] = []
+    max_in_flight = 0
+
+    def respond(request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # answer requests in pairs, so at most two can be in flight
+        nonlocal max_in_flight
+        in_flight.append(request)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        if len(in_flight) < 2:
+            return []
+        responses = [{"jsonrpc": "2.0", "id": r["id"], "result": r["id"] + 1000} for r in in_flight]
+        in_flight.clear()
+        return responses
+
+    client = make_ws_client(respond)
+    session = WatchSession(client, max_in_flight=2)
+    accounts = [
+        PythPriceAccount(SolanaPublicKey(i.to_bytes(SolanaPublicKey.LENGTH, "little")), client)
+        for i in range(6)
+    ]
+
+    assert await session.subscribe_many(accounts) == (6, 0)
+    assert max_in_flight == 2
+    assert len(session._subid_to_account) == 6
+    assert sorted(session._accountkey_to_subid) == sorted(str(account.key) for account in accounts)
+
+    assert await session.unsubscribe_many(accounts[:4]) == (4, 0)
+    assert len(session._subid_to_account) == 2
+    await session.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_program_subscribe_prices(requested: List[List[str]], make_ws_client: Callable[..., SolanaClient]) -> None:
+    sent: List[Dict[str, Any]] = []
+    aggregate_data = base64.b64decode(PRICE_ACCOUNT_B64_DATA)[:PRICE_AGGREGATE_DATA_LENGTH]
+
+    def respond(request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        sent.append(request)
+        return [
+            {"jsonrpc": "2.0", "id": request["id"], "result": 7},
+            {"jsonrpc": "2.0", "method": "programNotification", "params": {"subscription": 7, "result": {
+                "context": {"slot": 3},
+                "value": {"pubkey": BCH_PRICE_ACCOUNT_KEY, "account": {
+                    "data": [base64.b64encode(aggregate_data).decode(), "base64"], "lamports": 1}},
+            }}},
+        ]
+
+    client = make_ws_client(respond)
+    pyth_client = PythClient(solana_client=client, first_mapping_account_key=V2_FIRST_MAPPING_ACCOUNT_KEY,
+                             program_key=V2_PROGRAM_KEY)
+    session = pyth_client.create_watch_session()
+    await pyth_client.program_subscribe_prices(session)
+
+    assert sent[0]["method"] == "programSubscribe"
+    assert sent[0]["params"] == [V2_PROGRAM_KEY, {
+        "commitment": "confirmed",
+        "encoding": "base64",
+        "filters": [account_type_filter(PythAccountType.PRICE)],
+        "dataSlice": {"offset": 0, "length": PRICE_AGGREGATE_DATA_LENGTH},
+    }]
+
+    price = await session.next_update()
+    assert isinstance(price, PythPriceAccount)
+    assert str(price.key) == BCH_PRICE_ACCOUNT_KEY
+    assert price.slot == 3
+    assert price.aggregate_price_info is not None
+    assert price.price_components == []
+    await session.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_watch_session_next_updates(make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]) -> None:
+    client = make_ws_client(lambda r: [{"jsonrpc": "2.0", "id": r["id"], "result": r["id"]}])
+    session = WatchSession(client)
+    accounts = [SolanaAccount(SolanaPublicKey(i.to_bytes(SolanaPublicKey.LENGTH, "little")), client) for i in range(3)]
+    await session.subscribe_many(accounts)
+    subids = {id(account): subid for subid, account in session._subid_to_account.items()}
+    assert await session.next_updates(max_wait=0.01) == []
+
+    assert client._ws is not None
+    for account in [accounts[0], accounts[1], accounts[0], accounts[2]]:
+        client._ws.push(notification(subids[id(account)]))  # type: ignore
+    updated = await session.next_updates(max_items=3)
+    assert updated == [accounts[0], accounts[1], accounts[0]]
+
+    async for account in session:
+        assert account is accounts[2]
+        break
+    await session.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_watch_session_conflate(mocker: MockerFixture, make_ws_client: Callable[..., SolanaClient]) -> None:
+    price_b64 = PRICE_ACCOUNT_B64_DATA
+    price_data = bytearray(base64.b64decode(price_b64))
+    price_data[ACCOUNT_HEADER_BYTES + 8] ^= 1  # pub slot of the aggregate
+
+    def price_notification(data: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "method": "accountNotification", "params": {"subscription": 5, "result": {
+            "context": {"slot": 3}, "value": {"data": [data, "base64"], "lamports": 1}}}}
+
+    client = make_ws_client(lambda r: [{"jsonrpc": "2.0", "id": r["id"], "result": 5}])
+    session = WatchSession(client, conflate=True)
+    price = PythPriceAccount(SolanaPublicKey(BCH_PRICE_ACCOUNT_KEY), client)
+    await session.subscribe(price)
+    update = mocker.spy(price, "update_with_rpc_response")
+
+    assert client._ws is not None
+    client._ws.push(price_notification(price_b64))  # type: ignore
+    client._ws.push(price_notification(base64.b64encode(price_data).decode()))  # type: ignore
+    updated = await session.next_updates(max_wait=1)
+
+    assert updated == [price]
+    assert update.call_count == 1
+    assert price.data is not None and price.data == bytes(price_data[:len(price.data)])
+    assert session.updates_conflated == 1
+    # the client's own queue is left alone
+    assert client.update_queue.policy == SolanaUpdateQueuePolicy.BLOCK
+    assert client.update_queue.coalesced == 0
+    await session.disconnect()
+
+
+def test_create_sharded_watch_session(pyth_client: PythClient) -> None:
+    session = pyth_client.create_sharded_watch_session(3, ["wss://a.example.com", "wss://b.example.com"])
+    assert [shard._client.ws_endpoint for shard in session.shards] == [
+        "wss://a.example.com", "wss://b.example.com", "wss://a.example.com"
+    ]
+    assert all(shard._client.ratelimit is pyth_client.solana.ratelimit for shard in session.shards)
+
+
+@pytest.mark.asyncio
+async def test_watch_session_next_updates_skips_bad_notification(make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]) -> None:
+    client = make_ws_client(lambda r: [{"jsonrpc": "2.0", "id": r["id"], "result": 5}])
+    session = WatchSession(client)
+    account = SolanaAccount(SolanaPublicKey(BCH_PRICE_ACCOUNT_KEY), client)
+    await session.subscribe(account)
+
+    assert client._ws is not None
+    for subid in [5, 6, 5]:  # 6 is not a subscription
+        client._ws.push(notification(subid))  # type: ignore
+    await asyncio.sleep(0)
+    assert await session.next_updates(max_wait=1) == [account, account]
+    await session.disconnect()
+
+
+def test_program_subscribe_rejects_offset_slice(watch_session: WatchSession) -> None:
+    with pytest.raises(ValueError):
+        watch_session.program_subscribe(V2_PROGRAM_KEY, [], data_slice=(16, 100))
+
+
+@pytest.mark.asyncio
+async def test_program_subscribe_slice_ignores_other_accounts(make_ws_client: Callable[..., SolanaClient]) -> None:
+    def program_notification(key: str, b64_data: str, length: int) -> Dict[str, Any]:
+        data = base64.b64encode(base64.b64decode(b64_data)[:length]).decode()
+        return {"jsonrpc": "2.0", "method": "programNotification", "params": {"subscription": 7, "result": {
+            "context": {"slot": 3}, "value": {"pubkey": key, "account": {"data": [data, "base64"], "lamports": 1}},
+        }}}
+
+    client = make_ws_client(lambda r: [
+        {"jsonrpc": "2.0", "id": r["id"], "result": 7},
+        program_notification(BCH_PRODUCT_ACCOUNT_KEY, PRODUCT_ACCOUNT_B64_DATA, 120),
+        program_notification(BCH_PRICE_ACCOUNT_KEY, PRICE_ACCOUNT_B64_DATA, PRICE_AGGREGATE_DATA_LENGTH),
+    ])
+    product = PythProductAccount(SolanaPublicKey(BCH_PRODUCT_ACCOUNT_KEY), client)
+    price = PythPriceAccount(SolanaPublicKey(BCH_PRICE_ACCOUNT_KEY), client)
+    session = WatchSession(client)
+    await session.program_subscribe(V2_PROGRAM_KEY, [product, price], data_slice=(0, PRICE_AGGREGATE_DATA_LENGTH))
+
+    assert await session.next_updates(max_wait=1) == [price]
+    assert product.slot is None and product.attrs == {}
+    assert price.aggregate_price_info is not None
+    await session.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_check_price_changes_batched(
+    solana_client: SolanaClient, accounts: Dict[str, str], requested: List[List[str]]
+) -> None:
+    other_price_key = str(SolanaPublicKey(bytes([7] * 32)))
+    accounts[other_price_key] = PRICE_ACCOUNT_B64_DATA
+    products = []
+    for price_key in [BCH_PRICE_ACCOUNT_KEY, other_price_key]:
+        product = PythProductAccount(SolanaPublicKey(bytes([len(products) + 1] * 32)), solana_client)
+        product.first_price_account_key = SolanaPublicKey(price_key)
+        product._prices = {}
+        products.append(product)
+
+    added, removed = await check_price_changes(products, update_accounts=False)
+
+    assert requested == [[BCH_PRICE_ACCOUNT_KEY, other_price_key]]
+    assert sorted(str(price.key) for price in added) == sorted([BCH_PRICE_ACCOUNT_KEY, other_price_key])
+    assert removed == []
+    assert [str(price.key) for price in products[1].prices.values()] == [other_price_key]
+
+
+def test_create_sharded_watch_session_settings(pyth_client: PythClient) -> None:
+    session = pyth_client.create_sharded_watch_session(
+        2, max_in_flight=7, conflate=True, max_batch_requests=4, update_queue_size=50,
+        update_queue_policy=SolanaUpdateQueuePolicy.DROP_OLDEST,
+    )
+    for shard in session.shards:
+        assert (shard.max_in_flight, shard.conflate) == (7, True)
+        assert shard._client.max_batch_requests == 4
+        assert shard._client.max_concurrent_requests == pyth_client.solana.max_concurrent_requests
+        assert (shard._client.update_queue_size, shard._client.update_queue_policy) == (50, SolanaUpdateQueuePolicy.DROP_OLDEST)
@@ -0,0 +1,60 @@
+import base64
+from typing import Any, Dict, List
+
+import pytest
+
+from pythclient import layouts
+from pythclient.pythaccounts import ACCOUNT_HEADER_BYTES, PythPriceAccount, PythPriceType
+from pythclient.pythclient import PythClient
+from pythclient.revalidation import PythRevalidationEvent, PythRevalidationEventType
+from pythclient.solana import SolanaClient
+
+from pyth_account_data import (
+    BCH_PRICE_ACCOUNT_KEY,
+    PRICE_ACCOUNT_B64_DATA,
+    V2_FIRST_MAPPING_ACCOUNT_KEY,
+)
+
+
+@pytest.fixture
+def pyth_client(solana_client: SolanaClient) -> PythClient:
+    return PythClient(solana_client=solana_client, first_mapping_account_key=V2_FIRST_MAPPING_ACCOUNT_KEY)
+
+
+async def collect(revalidation: Any) -> List[PythRevalidationEvent]:
+    return [event async for event in revalidation]
+
+
+@pytest.mark.asyncio
+async def test_revalidation_loads_when_empty(pyth_client: PythClient, requested: List[List[str]]) -> None:
+    revalidation = pyth_client.revalidate()
+    events = await collect(revalidation)
+    await revalidation.ready
+    assert [event.type for event in events] == [PythRevalidationEventType.ADDED] * 3
+    assert str(pyth_client.products[0].prices[PythPriceType.PRICE].key) == BCH_PRICE_ACCOUNT_KEY
+
+
+@pytest.mark.asyncio
+async def test_revalidation_updates_priority_first(
+    pyth_client: PythClient, requested: List[List[str]], accounts: Dict[str, str]
+) -> None:
+    await pyth_client.refresh_all_prices()
+    price = pyth_client.products[0].prices[PythPriceType.PRICE]
+    raw_price = price.aggregate_price_info.raw_price
+
+    # change the aggregate price of the price account
+    data = bytearray(base64.b64decode(PRICE_ACCOUNT_B64_DATA))
+    data[ACCOUNT_HEADER_BYTES + layouts.PRICE_V2.size] ^= 1
+    accounts[BCH_PRICE_ACCOUNT_KEY] = base64.b64encode(data).decode("ascii")
+    requested.clear()
+
+    revalidation = pyth_client.revalidate(priority=[price.key])
+    events = await collect(revalidation)
+    await revalidation.ready
+
+    assert requested[0] == [BCH_PRICE_ACCOUNT_KEY]
+    assert events == [PythRevalidationEvent(PythRevalidationEventType.UPDATED, price)]
+    assert isinstance(events[0].account, PythPriceAccount)
+    assert price.aggregate_price_info.raw_price != raw_price
+    # nothing changed in the mapping or product accounts
+    assert pyth_client.products[0].prices[PythPriceType.PRICE] is price
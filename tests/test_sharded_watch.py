@@ -0,0 +1,77 @@
+from typing import Any, Callable, Dict, List
+
+import pytest
+from mock import AsyncMock
+from pytest_mock import MockerFixture
+
+from pythclient.shardedwatch import ShardedWatchSession
+from pythclient.solana import SolanaAccount, SolanaClient, SolanaPublicKey
+
+
+def make_key(i: int) -> SolanaPublicKey:
+    return SolanaPublicKey(i.to_bytes(SolanaPublicKey.LENGTH, "little"))
+
+
+@pytest.fixture
+def make_clients(make_ws_client: Callable[..., SolanaClient]) -> Callable[[int], List[SolanaClient]]:
+    def make(count: int) -> List[SolanaClient]:
+        return [make_ws_client(lambda r: [{"jsonrpc": "2.0", "id": r["id"], "result": r["id"]}]) for _ in range(count)]
+
+    return make
+
+
+def test_consistent_hashing(make_clients: Callable[[int], List[SolanaClient]]) -> None:
+    keys = [make_key(i) for i in range(1000)]
+    three = ShardedWatchSession(make_clients(3))
+    four = ShardedWatchSession(make_clients(4))
+
+    counts = [0] * 3
+    for key in keys:
+        counts[three.shard_index(key)] += 1
+    assert min(counts) > 200
+
+    # adding a shard only moves accounts to the new shard
+    moved = [key for key in keys if three.shard_index(key) != four.shard_index(key)]
+    assert all(four.shard_index(key) == 3 for key in moved)
+    assert len(moved) < 400
+
+
+@pytest.mark.asyncio
+async def test_sharded_subscribe_and_merge(
+    make_clients: Callable[[int], List[SolanaClient]], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    session = ShardedWatchSession(make_clients(2))
+    accounts = [SolanaAccount(make_key(i), session.shards[0]._client) for i in range(20)]
+
+    assert await session.subscribe_many(accounts) == (20, 0)
+    assert sorted(session.subscribed_keys) == sorted(str(account.key) for account in accounts)
+    for account in accounts:
+        assert str(account.key) in session.shard_for(account.key).subscribed_keys
+
+    # one update on each shard
+    expected: Dict[int, Any] = {}
+    for index, shard in enumerate(session.shards):
+        subid, account = next(iter(shard._subid_to_account.items()))
+        expected[index] = account
+        shard._client._ws.push(notification(subid))  # type: ignore
+    updated = await session.next_updates(max_wait=1)
+    while len(updated) < 2:
+        updated += await session.next_updates(max_wait=1)
+    assert sorted(map(id, updated)) == sorted(map(id, expected.values()))
+
+    assert await session.next_updates(max_wait=0.01) == []
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_next_updates_keeps_results_on_shard_error(
+    make_clients: Callable[[int], List[SolanaClient]], mocker: MockerFixture
+) -> None:
+    session = ShardedWatchSession(make_clients(2))
+    account = SolanaAccount(make_key(1), session.shards[0]._client)
+    mocker.patch.object(session.shards[0], "next_updates", AsyncMock(side_effect=RuntimeError("broken")))
+    mocker.patch.object(session.shards[1], "next_updates", AsyncMock(return_value=[account]))
+
+    with pytest.raises(RuntimeError):
+        await session.next_updates(max_wait=1)
+    assert await session.next_updates(max_wait=1) == [account]
@@ -0,0 +1,82 @@
+import multiprocessing
+from typing import Any, Tuple
+
+import pytest
+
+from pythclient.pythaccounts import PythPriceAccount, PythPriceInfo, PythPriceStatus, PythProductAccount
+from pythclient.sharedprices import _SEQUENCE, SharedPriceTable
+from pythclient.solana import SolanaClient, SolanaPublicKey
+
+
+def make_price_account(solana_client: SolanaClient, i: int, symbol: str) -> PythPriceAccount:
+    product = PythProductAccount(SolanaPublicKey(bytes([100 + i] * 32)), solana_client)
+    product.attrs = {"symbol": symbol}
+    account = PythPriceAccount(SolanaPublicKey(bytes([i + 1] * 32)), solana_client, product=product)
+    account.aggregate_price_info = PythPriceInfo(1000 + i, 10, PythPriceStatus.TRADING, 50, -2)
+    account.slot = 51
+    account.timestamp = 1700000000
+    return account
+
+
+def read_in_child(name: str, key: str, queue: Any) -> None:
+    table = SharedPriceTable.attach(name)
+    try:
+        price = table.read(key)
+        queue.put((len(table), tuple(price), table.read("Crypto.ETH/USD").raw_price))
+    finally:
+        table.close()
+
+
+def test_shared_price_table(solana_client: SolanaClient) -> None:
+    with SharedPriceTable.create(4) as table:
+        btc = make_price_account(solana_client, 0, "Crypto.BTC/USD")
+        eth = make_price_account(solana_client, 1, "Crypto.ETH/USD")
+        assert table.update(btc) == 0
+        assert table.update(eth) == 1
+        btc.aggregate_price_info = PythPriceInfo(2000, 20, PythPriceStatus.HALTED, 60, -2)
+        assert table.update(btc) == 0
+
+        price = table.read("Crypto.BTC/USD")
+        assert price == table.read(btc.key)
+        assert (price.raw_price, price.price_status, price.pub_slot, price.slot) == (2000, PythPriceStatus.HALTED, 60, 51)
+        assert price.price == 20.0
+        assert "Crypto.SOL/USD" not in table
+        with pytest.raises(KeyError):
+            table.read("Crypto.SOL/USD")
+
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=read_in_child, args=(table.name, str(btc.key), queue))
+        process.start()
+        result: Tuple[int, Tuple[Any, ...], int] = queue.get(timeout=30)
+        process.join(timeout=30)
+        assert result == (2, tuple(price), 1001)
+
+
+def test_shared_price_table_full(solana_client: SolanaClient) -> None:
+    with SharedPriceTable.create(1) as table:
+        table.update(make_price_account(solana_client, 0, "Crypto.BTC/USD"))
+        with pytest.raises(ValueError):
+            table.update(make_price_account(solana_client, 1, "Crypto.ETH/USD"))
+
+
+def test_shared_price_table_read_torn_row(solana_client: SolanaClient) -> None:
+    with SharedPriceTable.create(1) as table:
+        account = make_price_account(solana_client, 0, "Crypto.BTC/USD")
+        index = table.update(account)
+        assert index is not None
+        # a writer that died mid-write leaves the sequence number odd
+        offset = table._row_offset(index)
+        _SEQUENCE.pack_into(table._shm.buf, offset, _SEQUENCE.unpack_from(table._shm.buf, offset)[0] + 1)
+        with pytest.raises(TimeoutError):
+            table.read(account.key, timeout=0.01)
+
+
+def test_shared_price_table_truncates_symbol(solana_client: SolanaClient) -> None:
+    with SharedPriceTable.create(1) as table:
+        symbol = "Crypto." + "€" * 10  # 37 bytes
+        table.update(make_price_account(solana_client, 0, symbol))
+        table._symbol_index.clear()
+        table._keys.clear()
+        table._index.clear()
+        assert "Crypto." + "€" * 8 in table
@@ -0,0 +1,42 @@
+import pytest
+
+from pythclient.pythaccounts import ACCOUNT_HEADER_BYTES, PythPriceAccount
+from pythclient.snapshot import PythSnapshot, write_snapshot
+from pythclient.solana import SolanaClient, SolanaPublicKey
+
+
+def test_snapshot_read_write(price_account_bytes: bytes, solana_client: SolanaClient, tmp_path) -> None:
+    account = PythPriceAccount(SolanaPublicKey("5ALDzwcRJfSyGdGyhP3kP628aqBNHZzLuVww7o9kdspe"), solana_client)
+    account.update_with_data(1234, price_account_bytes)
+    never_updated = PythPriceAccount(SolanaPublicKey(bytes(range(32))), solana_client)
+    path = str(tmp_path / "snapshot")
+
+    assert write_snapshot(path, [account, never_updated]) == 1
+
+    with PythSnapshot(path) as snapshot:
+        assert len(snapshot) == 1 and snapshot.slot == 1234
+        assert account.key in snapshot and str(account.key) in snapshot
+        assert never_updated.key not in snapshot
+        assert list(snapshot.keys()) == [account.key]
+        assert snapshot.get(account.key) == (1234, account.data)
+
+        restored = PythPriceAccount(account.key, solana_client)
+        assert snapshot.load(restored)
+        assert not snapshot.load(never_updated)
+    assert restored.slot == 1234
+    assert restored.aggregate_price_info == account.aggregate_price_info
+    assert restored.data == price_account_bytes[:len(restored.data)]
+
+
+def test_snapshot_rejects_bad_files(price_account_bytes: bytes, solana_client: SolanaClient, tmp_path) -> None:
+    path = tmp_path / "snapshot"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        PythSnapshot(str(path))
+
+    account = PythPriceAccount(SolanaPublicKey(bytes(range(32))), solana_client)
+    account.update_with_data(1, price_account_bytes)
+    write_snapshot(str(path), [account])
+    path.write_bytes(path.read_bytes()[:ACCOUNT_HEADER_BYTES + 100])
+    with pytest.raises(ValueError):
+        PythSnapshot(str(path))
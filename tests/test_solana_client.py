@@ -0,0 +1,340 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, List
+
+import pytest
+from mock import AsyncMock
+from pytest_mock import MockerFixture
+
+from pythclient.exceptions import SolanaException, WebSocketClosedException
+from pythclient import codec
+from pythclient.solana import (
+    SolanaAccount, SolanaClient, SolanaPublicKey, SolanaUpdateQueue, SolanaUpdateQueuePolicy, data_size_filter, memcmp_filter
+)
+
+
+def make_accounts(solana_client: SolanaClient, count: int) -> List[SolanaAccount]:
+    return [SolanaAccount(SolanaPublicKey(i.to_bytes(SolanaPublicKey.LENGTH, "little")), solana_client)
+            for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_update_accounts_concurrent(solana_client: SolanaClient, mocker: MockerFixture) -> None:
+    in_flight = 0
+    max_in_flight = 0
+    calls = 0
+
+    async def get_account_info(keys: List[SolanaPublicKey]) -> Dict[str, Any]:
+        nonlocal in_flight, max_in_flight, calls
+        calls += 1
+        slot = 100 + calls
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"context": {"slot": slot}, "value": [{"lamports": 1} for _ in keys]}
+
+    mocker.patch('pythclient.solana.SolanaClient.get_account_info', side_effect=AsyncMock(side_effect=get_account_info))
+    accounts = make_accounts(solana_client, 450)
+
+    min_slot, max_slot = await solana_client.update_accounts(accounts, max_concurrency=3)
+
+    assert calls == 5
+    assert max_in_flight == 3
+    assert (min_slot, max_slot) == (101, 105)
+    assert all(account.lamports == 1 for account in accounts)
+    assert all(account.slot is not None and min_slot <= account.slot <= max_slot for account in accounts)
+
+
+@pytest.mark.asyncio
+async def test_update_accounts_serial_by_default(solana_client: SolanaClient, mocker: MockerFixture) -> None:
+    mock = AsyncMock(return_value={"context": {"slot": 7}, "value": [None] * 100})
+    mocker.patch('pythclient.solana.SolanaClient.get_account_info', side_effect=mock)
+    assert solana_client.max_concurrent_requests == 1
+
+    assert await solana_client.update_accounts(make_accounts(solana_client, 200)) == (7, 7)
+    assert await solana_client.update_accounts([]) == (None, None)
+    assert mock.call_count == 2
+
+
+def respond_with_method(request: Dict[str, Any]) -> Dict[str, Any]:
+    if request["method"] == "getBalance":
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32602, "message": "invalid"}}
+    return {"jsonrpc": "2.0", "id": request["id"], "result": request["method"]}
+
+
+@pytest.mark.asyncio
+async def test_http_send_batch(make_fake_session: Callable[..., Any]) -> None:
+    session = make_fake_session(respond_with_method)
+    client = SolanaClient(client=session, ratelimit=False, endpoint="https://example.com")  # type: ignore
+
+    results = await client.http_send_batch([("getSlot", None), ("getBlockTime", [1]), ("getBalance", ["x"])],
+                                           return_error=True)
+
+    assert len(session.posted) == 1
+    assert [request["method"] for request in session.posted[0]] == ["getSlot", "getBlockTime", "getBalance"]
+    assert results[:2] == ["getSlot", "getBlockTime"]
+    assert results[2]["code"] == -32602
+
+
+@pytest.mark.asyncio
+async def test_batch_request_futures(make_fake_session: Callable[..., Any]) -> None:
+    session = make_fake_session(respond_with_method)
+    client = SolanaClient(client=session, ratelimit=False, endpoint="https://example.com")  # type: ignore
+
+    batch = client.batch()
+    slot = batch.get_slot()
+    accounts = batch.get_account_info(["AHtgzX45WTKfkPG53L6WYhGEXwQkN1BVknET3sVsLL8J"])
+    balance = batch.get_balance("AHtgzX45WTKfkPG53L6WYhGEXwQkN1BVknET3sVsLL8J")
+    assert len(batch) == 3
+    await batch.send()
+
+    assert slot.result() == "getSlot"
+    assert accounts.result() == "getMultipleAccounts"
+    with pytest.raises(SolanaException):
+        balance.result()
+
+
+@pytest.mark.asyncio
+async def test_update_accounts_batched(make_fake_session: Callable[..., Any]) -> None:
+    def respond(request: Dict[str, Any]) -> Dict[str, Any]:
+        keys = request["params"][0]
+        return {"jsonrpc": "2.0", "id": request["id"],
+                "result": {"context": {"slot": request["id"]}, "value": [{"lamports": 2} for _ in keys]}}
+
+    session = make_fake_session(respond)
+    client = SolanaClient(
+        client=session, ratelimit=False, endpoint="https://example.com", max_batch_requests=2  # type: ignore
+    )
+    accounts = make_accounts(client, 250)
+
+    min_slot, max_slot = await client.update_accounts(accounts)
+
+    # 3 getMultipleAccounts calls: two in one batch, the last one on its own
+    assert len(session.posted) == 2
+    assert len(session.posted[0]) == 2
+    assert session.posted[1]["method"] == "getMultipleAccounts"
+    assert (min_slot, max_slot) == (0, 2)
+    assert all(account.lamports == 2 for account in accounts)
+
+
+@pytest.mark.asyncio
+async def test_get_program_accounts_filters(make_fake_session: Callable[..., Any]) -> None:
+    session = make_fake_session(lambda request: {"jsonrpc": "2.0", "id": request["id"], "result": []})
+    client = SolanaClient(client=session, ratelimit=False, endpoint="https://example.com")  # type: ignore
+
+    await client.get_program_accounts("AHtgzX45WTKfkPG53L6WYhGEXwQkN1BVknET3sVsLL8J")
+    await client.get_program_accounts(
+        "AHtgzX45WTKfkPG53L6WYhGEXwQkN1BVknET3sVsLL8J",
+        filters=[memcmp_filter(8, bytes([3, 0, 0, 0])), data_size_filter(3312)],
+        data_slice=(0, 240),
+    )
+
+    assert "filters" not in session.posted[0]["params"][1]
+    assert "dataSlice" not in session.posted[0]["params"][1]
+    config = session.posted[1]["params"][1]
+    assert config["filters"] == [{"memcmp": {"offset": 8, "bytes": "5Sxr3"}}, {"dataSize": 3312}]
+    assert config["dataSlice"] == {"offset": 0, "length": 240}
+    assert config["withContext"] is True
+
+
+@pytest.mark.asyncio
+async def test_ws_send_pipelined(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    held: List[Dict[str, Any]] = []
+
+    def respond(request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # hold responses until all three requests are in flight, then answer
+        # them in reverse order with a notification in between
+        held.append(request)
+        if len(held) < 3:
+            return []
+        return [notification(0)] + [{"jsonrpc": "2.0", "id": r["id"], "result": r["params"][0]} for r in reversed(held)]
+
+    client = make_ws_client(respond)
+    results = await asyncio.gather(*(client.ws_send("accountSubscribe", [f"key{i}"]) for i in range(3)))
+
+    assert results == ["key0", "key1", "key2"]
+    assert (await client.get_next_update())["params"]["subscription"] == 0
+    await client.ws_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_ws_send_error_response(make_ws_client: Callable[..., SolanaClient]) -> None:
+    client = make_ws_client(lambda r: [{"jsonrpc": "2.0", "id": r["id"], "error": {"code": -1, "message": "bad"}}])
+    with pytest.raises(SolanaException):
+        await client.ws_send("accountSubscribe", ["key"])
+    await client.ws_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_ws_reader_skips_bad_frames(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    client = make_ws_client(lambda r: ["not json", "[1, 2]", {"jsonrpc": "2.0", "id": r["id"], "result": 5}])
+    assert await client.ws_send("accountSubscribe", ["key"]) == 5
+    client._ws.push(notification(5))  # type: ignore
+    assert (await client.get_next_update())["params"]["subscription"] == 5
+    assert await client.ws_send("accountSubscribe", ["key"]) == 5
+    await client.ws_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_ws_closed_by_server(make_ws_client: Callable[..., SolanaClient]) -> None:
+    client = make_ws_client(lambda r: [None])
+    with pytest.raises(WebSocketClosedException):
+        await client.ws_send("accountSubscribe", ["key"])
+    with pytest.raises(WebSocketClosedException):
+        await client.get_next_update()
+
+
+@pytest.mark.asyncio
+async def test_ws_disconnect_wakes_update_waiter(make_ws_client: Callable[..., SolanaClient]) -> None:
+    client = make_ws_client(lambda r: [])
+    with pytest.raises(WebSocketClosedException):
+        await client.get_next_update()
+
+    await client.ws_connect()
+    waiter = asyncio.ensure_future(client.get_next_update())
+    await asyncio.sleep(0)
+    await client.ws_disconnect()
+    with pytest.raises(WebSocketClosedException):
+        await waiter
+
+
+@pytest.mark.asyncio
+async def test_get_next_notifications(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    client = make_ws_client(lambda r: [notification(i) for i in range(5)] + [None])
+    await client.ws_connect()
+    assert await client.get_next_notifications(10, max_wait=0.01) == []
+
+    assert client._ws is not None
+    await client._ws.send_str(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}))
+    first = await client.get_next_notifications(3)
+    assert [n.subscription for n in first] == [0, 1, 2]
+    rest = await client.get_next_notifications(10)
+    assert [n.subscription for n in rest] == [3, 4]
+    with pytest.raises(WebSocketClosedException):
+        await client.get_next_notifications(10)
+
+
+def decoded_notification(subscription: int, slot: int = 1) -> codec.AccountNotification:
+    msg = {"jsonrpc": "2.0", "method": "accountNotification",
+           "params": {"subscription": subscription, "result": {"context": {"slot": slot}, "value": {}}}}
+    result = codec.decode_ws_message(json.dumps(msg))
+    assert isinstance(result, codec.AccountNotification)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_update_queue_drop_oldest() -> None:
+    queue = SolanaUpdateQueue(2, SolanaUpdateQueuePolicy.DROP_OLDEST)
+    for i in range(4):
+        queue.put_nowait(decoded_notification(i))
+    assert queue.dropped == 2
+    assert queue.high_water == 2
+    assert [queue.get_nowait().subscription for _ in range(len(queue))] == [2, 3]  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_update_queue_coalesce() -> None:
+    queue = SolanaUpdateQueue(0, SolanaUpdateQueuePolicy.COALESCE)
+    for subscription, slot in [(1, 1), (2, 1), (1, 2), (1, 3)]:
+        queue.put_nowait(decoded_notification(subscription, slot))
+    queue.put_nowait({"method": "slotNotification"})
+    assert queue.coalesced == 2
+    first = queue.get_nowait()
+    assert isinstance(first, codec.AccountNotification)
+    assert (first.subscription, first.slot) == (1, 3)
+    assert queue.get_nowait().subscription == 2  # type: ignore
+    assert queue.get_nowait() == {"method": "slotNotification"}
+
+    queue.close(WebSocketClosedException("closed"))
+    with pytest.raises(WebSocketClosedException):
+        await queue.get()
+
+
+@pytest.mark.asyncio
+async def test_ws_update_queue_block(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    client = make_ws_client(lambda r: [])
+    client.update_queue_size = 1
+    await client.ws_connect()
+    assert client._ws is not None
+    for i in range(3):
+        client._ws.push(notification(i))  # type: ignore
+
+    # the reader leaves notifications unread until the consumer catches up
+    for i in range(3):
+        await asyncio.sleep(0.01)
+        assert len(client.update_queue) == 1
+        assert (await client.get_next_notification()).subscription == i  # type: ignore
+    assert client.update_queue.dropped == 0
+    await client.ws_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_ws_update_queue_bounded(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    client = make_ws_client(lambda r: [notification(i) for i in range(5)])
+    client.update_queue_size = 2
+    client.update_queue_policy = SolanaUpdateQueuePolicy.DROP_OLDEST
+    await client.ws_connect()
+    assert client._ws is not None
+    await client._ws.send_str(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}))
+    updates = await client.get_next_notifications(10)
+    assert [n.subscription for n in updates] == [3, 4]  # type: ignore
+    assert client.update_queue.dropped == 3
+    await client.ws_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_next_notifications_no_wait(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    client = make_ws_client(lambda r: [notification(i) for i in range(5)])
+    await client.ws_connect()
+    assert await client.get_next_notifications(10, max_wait=0) == []
+
+    assert client._ws is not None
+    await client._ws.send_str(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}))
+    await asyncio.sleep(0)
+    updates = await client.get_next_notifications(10, max_wait=0)
+    assert [n.subscription for n in updates] == [0, 1, 2, 3, 4]  # type: ignore
+
+    await client.ws_disconnect()
+    with pytest.raises(WebSocketClosedException):
+        await client.get_next_notifications(10, max_wait=0)
+
+
+@pytest.mark.asyncio
+async def test_ws_update_queue_block_reads_responses(
+    make_ws_client: Callable[..., SolanaClient], notification: Callable[[int], Dict[str, Any]]
+) -> None:
+    # the server sends notifications before each response
+    client = make_ws_client(
+        lambda r: [notification(i) for i in range(3)] + [{"jsonrpc": "2.0", "id": r["id"], "result": 1}]
+    )
+    client.update_queue_size = 2
+    await client.ws_connect()
+
+    assert await asyncio.wait_for(client.ws_account_subscribe("key"), 1) == 1
+    assert await asyncio.wait_for(client.ws_account_subscribe("key"), 1) == 1
+    assert len(client.update_queue) == 6
+    assert client.update_queue.dropped == 0
+
+    # with no request pending, the reader waits for the consumer
+    assert client._ws is not None
+    client._ws.push(notification(9))  # type: ignore
+    await asyncio.sleep(0.01)
+    assert len(client.update_queue) == 6
+    updates = await client.get_next_notifications(10, max_wait=0)
+    assert len(updates) == 6
+    await asyncio.sleep(0.01)
+    assert [n.subscription for n in await client.get_next_notifications(10, max_wait=0)] == [9]  # type: ignore
+    await client.ws_disconnect()
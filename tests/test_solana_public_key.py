@@ -0,0 +1,41 @@
+import base58
+import pytest
+
+from pythclient.solana import SolanaPublicKey
+
+KEY_STR = "AHtgzX45WTKfkPG53L6WYhGEXwQkN1BVknET3sVsLL8J"
+KEY_BYTES = base58.b58decode(KEY_STR)
+
+
+def test_public_key_from_str_and_bytes() -> None:
+    from_str = SolanaPublicKey(KEY_STR)
+    from_bytes = SolanaPublicKey(KEY_BYTES)
+    assert str(from_str) == str(from_bytes) == KEY_STR
+    assert bytes(from_str) == bytes(from_bytes) == KEY_BYTES
+    assert from_str == from_bytes
+    assert hash(from_str) == hash(from_bytes)
+    assert from_str != SolanaPublicKey.NULL_KEY
+    assert from_str != KEY_STR
+
+
+def test_public_key_invalid_length() -> None:
+    with pytest.raises(ValueError):
+        SolanaPublicKey(b"\x01" * 31)
+    with pytest.raises(ValueError):
+        SolanaPublicKey(base58.b58encode(b"\x01" * 33).decode())
+    with pytest.raises(ValueError):
+        SolanaPublicKey(42)  # type: ignore
+
+
+def test_public_key_from_bytes_is_interned() -> None:
+    key = SolanaPublicKey.from_bytes(KEY_BYTES)
+    assert key == SolanaPublicKey(KEY_STR)
+    assert SolanaPublicKey.from_bytes(bytes(bytearray(KEY_BYTES))) is key
+
+
+def test_public_key_encodes_lazily() -> None:
+    key = SolanaPublicKey(b"\x02" * SolanaPublicKey.LENGTH)
+    assert key._key is None
+    assert str(key) == base58.b58encode(b"\x02" * SolanaPublicKey.LENGTH).decode()
+    assert key._key == str(key)
+    assert not hasattr(key, "__dict__")